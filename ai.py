@@ -1,7 +1,69 @@
+import random
+import time
+
+from transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from rules import get_rules
+from evaluator import IncrementalEvaluator
+
+# Thinking time per move (seconds) for each difficulty level
+DIFFICULTY_TIME_LIMITS = {
+    "easy": 0.2,
+    "medium": 1.0,
+    "hard": 2.0,
+}
+
+# How many nodes to search between clock checks
+BUDGET_CHECK_INTERVAL = 256
+
+# Evaluation tables shared by every AI, keyed by (board size, window length)
+_EVALUATION_TABLES = {}
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the per-move time or node budget runs out"""
+
+
 class AI:
     def __init__(self):
-        self.max_depth = 3 
+        self.max_depth = 3  # Deepest iteration of iterative deepening, None for no limit
         self.difficulty = "medium" 
+        
+        # Per-move search budget; with neither set the search always reaches max_depth
+        self.time_limit = None  # Seconds
+        self.node_limit = None
+        
+        # Depth of the iteration currently being searched, and the last one that finished
+        self.search_depth = 0
+        self.completed_depth = 0
+        self.deadline = None
+        
+        # Cache of searched positions keyed by the board's Zobrist hash
+        self.use_transposition_table = True
+        self.transposition_table = TranspositionTable(max_memory_mb=16)
+        
+        # Principal variation search at the root: only the moves the difficulty
+        # level may pick get exact scores, the rest are refuted with null windows
+        self.use_root_pvs = True
+        
+        # Evaluation score and win detection kept up to date on every make / undo
+        self.use_incremental_evaluation = True
+        self.evaluator = None
+        
+        # Move ordering: table move, wins, blocks, killer moves, then history scores
+        self.use_move_ordering = True
+        self.killer_moves = []  # Per ply: up to two moves that caused a cutoff
+        self.history = {1: {}, 2: {}}  # Per player: move -> accumulated cutoff bonus
+        
+        # Search statistics for the last move
+        self.nodes_searched = 0
+        self.root_nodes = []  # (move, nodes searched under it) in the last root search, in search order
+        self.root_researches = 0  # Root null-window searches that failed high and were searched again
+        
+        # Search moves currently on the board, in the order they were played
+        self.move_stack = []
+        
+        # Player the AI moves for, taken from game_logic on every move
+        self.player = 2
     
     def make_move(self, board, game_logic):
         """
@@ -10,20 +72,160 @@ class AI:
         - Medium: Occasionally makes a suboptimal move
         - Easy: Frequently makes suboptimal moves
         """
+        self.player = game_logic.get_current_player()
+        
+        # Scores depend on the distance from the root, so entries are only valid for this search
+        self.transposition_table.clear()
+        self.nodes_searched = 0
+        self.completed_depth = 0
+        self.killer_moves = []
+        self.history = {1: {}, 2: {}}
+        self.move_stack = []
+        
+        if self.use_incremental_evaluation:
+            self.evaluator = self.create_evaluator(board, game_logic)
+        else:
+            self.evaluator = None
+        
+        if self.time_limit is not None:
+            self.deadline = time.perf_counter() + self.time_limit
+        else:
+            self.deadline = None
+        
+        empty_cells = board.get_empty_cells()
+        depth_limit = len(empty_cells)
+        if self.max_depth is not None:
+            depth_limit = min(depth_limit, self.max_depth)
+        
+        # Choose how many of the best moves the pick is made from, based on difficulty
+        move_count = len(empty_cells)
+        top_k = 1
+        if self.difficulty == "medium":
+            # Medium: 90% best move, 10% second best or worse
+            if random.random() >= 0.9 and move_count > 2:
+                top_k = min(3, move_count - 1) + 1
+        elif self.difficulty != "hard":
+            # Easy: 70% best move, 30% suboptimal move
+            if random.random() >= 0.7 and move_count > 2:
+                top_k = min(move_count - 1, 4) + 1
+        
+        # Iterative deepening: search depth 1, 2, 3, ... and keep the last completed result
+        # Every iteration scores the top_k best moves exactly, so a suboptimal pick is
+        # ready whenever the time limit stops the deepening
+        moves_with_scores = []
+        for search_depth in range(1, max(depth_limit, 1) + 1):
+            self.search_depth = search_depth
+            root_order = [move for move, _ in moves_with_scores]
+            try:
+                moves_with_scores = self.search_root(board, game_logic, root_order, top_k)
+            except SearchTimeout:
+                self.unwind(board)
+                break
+            
+            self.completed_depth = search_depth
+        
+        self.evaluator = None
+        
+        if top_k == 1:
+            # Always choose the best move
+            return moves_with_scores[0][0]
+        
+        elif self.difficulty == "medium":
+            suboptimal_index = random.randint(1, top_k - 1)
+            return moves_with_scores[suboptimal_index][0]
+        
+        else:  # Easy mode
+            max_index = top_k - 1
+            weights = [1] + [2] * max_index 
+            suboptimal_index = random.choices(range(max_index + 1), weights=weights)[0]
+            return moves_with_scores[suboptimal_index][0]
+    
+    def unwind(self, board):
+        """
+        Take back the moves that were on the board when the budget ran out,
+        last played first, so the board and evaluator unwind as they were built
+        """
+        while self.move_stack:
+            row, col, player = self.move_stack[-1]
+            self.take_back(board, row, col, player)
+    
+    def search_root(self, board, game_logic, root_order=None, top_k=1):
+        """
+        Score the AI moves at the current search depth, from the side of the AI's player
+        root_order: moves sorted by the previous iteration, searched in that order
+        top_k: how many of the best moves need exact scores
+        Returns a list of (move, score) sorted best first; with principal variation
+        search only the first top_k scores are exact, the rest are upper bounds
+        """
+        moves = board.get_empty_cells()
+        if root_order:
+            moves = [move for move in root_order if move in moves]
+        elif self.use_move_ordering:
+            moves = self.order_moves(game_logic, moves, self.player, 0)
+        
+        if not self.use_root_pvs:
+            return self.search_root_shared_alpha(board, game_logic, moves)
+        
+        exact_moves = []  # Best top_k moves with exact scores, best first
+        other_moves = []  # Moves that were refuted, with an upper bound on their score
+        self.root_nodes = []
+        self.root_researches = 0
+        
+        for row, col in moves:
+            nodes_before = self.nodes_searched
+            self.play(board, row, col, self.player)
+            
+            if len(exact_moves) < top_k:
+                # Full window until there are top_k exact scores
+                score = self.score_move(board, game_logic, float('-inf'), float('inf'))
+                is_exact = True
+            else:
+                # Null window: can this move beat the k-th best score at all?
+                threshold = exact_moves[-1][1]
+                score = self.score_move(board, game_logic, threshold, threshold + 1)
+                is_exact = False
+                if score > threshold:
+                    # Fail high: re-search for the exact score
+                    self.root_researches += 1
+                    score = self.score_move(board, game_logic, threshold, float('inf'))
+                    is_exact = score > threshold
+            
+            self.take_back(board, row, col, self.player)
+            self.root_nodes.append(((row, col), self.nodes_searched - nodes_before))
+            
+            if is_exact:
+                exact_moves.append(((row, col), score))
+                exact_moves.sort(key=lambda x: x[1], reverse=True)
+                if len(exact_moves) > top_k:
+                    other_moves.append(exact_moves.pop())
+            else:
+                other_moves.append(((row, col), score))
+        
+        other_moves.sort(key=lambda x: x[1], reverse=True)
+        return exact_moves + other_moves
+    
+    def search_root_shared_alpha(self, board, game_logic, moves):
+        """
+        Original root search: every move gets its own minimax call with a shared alpha
+        """
         # Get all possible moves with their scores
         moves_with_scores = []
         alpha = float('-inf')
         beta = float('inf')
+        self.root_nodes = []
+        self.root_researches = 0
         
         # Try each empty cell and calculate its score
-        for row, col in board.get_empty_cells():
-            board.make_move(row, col, 2) 
+        for row, col in moves:
+            nodes_before = self.nodes_searched
+            self.play(board, row, col, self.player)
             
             # Calculate score using minimax
-            score = self.minimax(board, game_logic, 0, False, alpha, beta)
+            score = self.score_move(board, game_logic, alpha, beta)
             
             # Undo the move
-            board.undo_move(row, col)
+            self.take_back(board, row, col, self.player)
+            self.root_nodes.append(((row, col), self.nodes_searched - nodes_before))
             
             # Store the move and its score
             moves_with_scores.append(((row, col), score))
@@ -33,137 +235,279 @@ class AI:
         
         # Sort moves by score (best moves first)
         moves_with_scores.sort(key=lambda x: x[1], reverse=True)
+        return moves_with_scores
+    
+    def score_move(self, board, game_logic, alpha, beta):
+        """
+        Minimax score of the position after a root move, from the side of the AI's player
+        minimax scores favour player 2, so for player 1 the window and score are negated
+        """
+        if self.player == 2:
+            return self.minimax(board, game_logic, 0, False, alpha, beta)
+        return -self.minimax(board, game_logic, 0, True, -beta, -alpha)
+    
+    def play(self, board, row, col, player):
+        """
+        Make a search move on the board and in the incremental evaluator
+        """
+        board.make_move(row, col, player)
+        self.move_stack.append((row, col, player))
+        if self.evaluator is not None:
+            self.evaluator.place(row, col, player)
+    
+    def take_back(self, board, row, col, player):
+        """
+        Undo a search move on the board and in the incremental evaluator
+        """
+        if self.evaluator is not None:
+            self.evaluator.remove(row, col, player)
+        board.undo_move(row, col)
+        self.move_stack.pop()
+    
+    def create_evaluator(self, board, game_logic):
+        """
+        Build an incremental evaluator for the current position
+        """
+        _, table = self.get_evaluation_table(board.size)
+        return IncrementalEvaluator(board, table, game_logic.get_rules())
+    
+    def out_of_budget(self):
+        """
+        Check whether the time or node budget for this move has run out
+        The first iteration always finishes so there is a move to play
+        """
+        if self.search_depth <= 1:
+            return False
+        if self.node_limit is not None and self.nodes_searched >= self.node_limit:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+    
+    def order_moves(self, game_logic, moves, player, depth, tt_move=None):
+        """
+        Sort moves so the ones most likely to cause a cutoff are searched first:
+        the transposition table move, immediate wins, blocks of opponent wins,
+        killer moves for this ply, then by history score
+        """
+        opponent = 3 - player
+        killers = self.killer_moves[depth] if depth < len(self.killer_moves) else ()
+        history = self.history[player]
+        if self.evaluator is not None:
+            is_winning_move = self.evaluator.is_winning_move
+        else:
+            is_winning_move = game_logic.is_winning_move
         
-        # Choose move based on difficulty
-        import random
-        
-        if self.difficulty == "hard" or len(moves_with_scores) <= 1:
-            # Hard: Always choose the best move
-            return moves_with_scores[0][0]
-        
-        elif self.difficulty == "medium":
-            # Medium: 90% best move, 10% second best or worse
-            if random.random() < 0.9 or len(moves_with_scores) <= 2:
-                return moves_with_scores[0][0]  # Best move
+        scored_moves = []
+        for move in moves:
+            row, col = move
+            if move == tt_move:
+                priority = 4000000
+            elif is_winning_move(row, col, player):
+                priority = 3000000
+            elif is_winning_move(row, col, opponent):
+                priority = 2000000
+            elif move in killers:
+                priority = 1000000
             else:
-                suboptimal_index = random.randint(1, min(3, len(moves_with_scores) - 1))
-                return moves_with_scores[suboptimal_index][0]
+                priority = history.get(move, 0)
+            scored_moves.append((priority, move))
         
-        else:  # Easy mode
-            # Easy: 70% best move, 30% suboptimal move
-            if random.random() < 0.7 or len(moves_with_scores) <= 2:
-                return moves_with_scores[0][0]  # Best move
-            else:
-            
-                max_index = min(len(moves_with_scores) - 1, 4)  
-                weights = [1] + [2] * max_index 
-                suboptimal_index = random.choices(range(max_index + 1), weights=weights[:max_index+1])[0]
-                return moves_with_scores[suboptimal_index][0]
+        # Stable sort keeps row-major order between equal priorities
+        scored_moves.sort(key=lambda x: x[0], reverse=True)
+        return [move for _, move in scored_moves]
+    
+    def record_cutoff(self, move, player, depth, remaining_depth):
+        """
+        Remember a move that caused a beta cutoff as a killer for this ply
+        and reward it in the history table
+        """
+        while len(self.killer_moves) <= depth:
+            self.killer_moves.append([])
+        killers = self.killer_moves[depth]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        
+        history = self.history[player]
+        history[move] = history.get(move, 0) + remaining_depth * remaining_depth
     
     def minimax(self, board, game_logic, depth, is_maximizing, alpha, beta):
         """
         Minimax algorithm with Alpha-Beta pruning
+        Positions already searched to at least the same remaining depth are taken
+        from the transposition table
         """
-        # Check if AI wins
-        if game_logic.check_win(2):
-            return 100 - depth
+        self.nodes_searched += 1
+        if self.nodes_searched % BUDGET_CHECK_INTERVAL == 0 and self.out_of_budget():
+            raise SearchTimeout()
         
-        # Check if human wins
-        if game_logic.check_win(1):
-            return -100 + depth
+        evaluator = self.evaluator
+        if evaluator is not None:
+            # The evaluator's line counters know whether the last move completed a line
+            if evaluator.completed_lines[2]:
+                return 100 - depth
+            if evaluator.completed_lines[1]:
+                return -100 + depth
+        else:
+            # Check if AI wins
+            if game_logic.check_win(2):
+                return 100 - depth
+            
+            # Check if human wins
+            if game_logic.check_win(1):
+                return -100 + depth
         
         # Check if it's a draw
         if board.is_board_full():
             return 0
         
         # Check if maximum depth is reached
-        if depth >= self.max_depth:
+        if depth >= self.search_depth:
+            if evaluator is not None:
+                return evaluator.score
             return self.evaluate_board(board)
         
+        remaining_depth = self.search_depth - depth
+        moves = board.get_empty_cells()
+        tt_move = None
+        
+        if self.use_transposition_table:
+            entry = self.transposition_table.probe(board.hash)
+            if entry is not None:
+                _, entry_depth, entry_score, entry_flag, entry_move = entry
+                if entry_depth >= remaining_depth:
+                    if entry_flag == EXACT:
+                        return entry_score
+                    elif entry_flag == LOWER_BOUND:
+                        alpha = max(alpha, entry_score)
+                    else:
+                        beta = min(beta, entry_score)
+                    if beta <= alpha:
+                        return entry_score
+                tt_move = entry_move
+        
+        if self.use_move_ordering:
+            moves = self.order_moves(game_logic, moves, 2 if is_maximizing else 1, depth, tt_move)
+        elif tt_move in moves:
+            # Search the stored best move first
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        
+        # Window the children are searched with, after any narrowing from the table
+        original_alpha, original_beta = alpha, beta
+        
+        best_move = None
+        
         if is_maximizing:
             # AI's turn (maximizing)
             best_score = float('-inf')
             
-            for row, col in board.get_empty_cells():
+            for row, col in moves:
                 # Make the move
-                board.make_move(row, col, 2)  # 2 represents AI (O)
+                self.play(board, row, col, 2)  # 2 represents AI (O)
                 
                 # Recursively calculate score
                 score = self.minimax(board, game_logic, depth + 1, False, alpha, beta)
                 
                 # Undo the move
-                board.undo_move(row, col)
+                self.take_back(board, row, col, 2)
                 
                 # Update best score
-                best_score = max(best_score, score)
+                if score > best_score:
+                    best_score = score
+                    best_move = (row, col)
                 
                 # Alpha-Beta pruning
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
+                    if self.use_move_ordering:
+                        self.record_cutoff((row, col), 2, depth, remaining_depth)
                     break
-            
-            return best_score
         else:
             # Human's turn (minimizing)
             best_score = float('inf')
             
-            for row, col in board.get_empty_cells():
+            for row, col in moves:
                 # Make the move
-                board.make_move(row, col, 1)  # 1 represents human (X)
+                self.play(board, row, col, 1)  # 1 represents human (X)
                 
                 # Recursively calculate score
                 score = self.minimax(board, game_logic, depth + 1, True, alpha, beta)
                 
                 # Undo the move
-                board.undo_move(row, col)
+                self.take_back(board, row, col, 1)
                 
                 # Update best score
-                best_score = min(best_score, score)
+                if score < best_score:
+                    best_score = score
+                    best_move = (row, col)
                 
                 # Alpha-Beta pruning
                 beta = min(beta, best_score)
                 if beta <= alpha:
+                    if self.use_move_ordering:
+                        self.record_cutoff((row, col), 1, depth, remaining_depth)
                     break
-            
-            return best_score
+        
+        if self.use_transposition_table:
+            # Scores outside the search window are only bounds on the true value
+            if best_score <= original_alpha:
+                flag = UPPER_BOUND
+            elif best_score >= original_beta:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            self.transposition_table.store(board.hash, remaining_depth, best_score, flag, best_move)
+        
+        return best_score
     
     def evaluate_board(self, board):
         """
         Evaluate the current board state
         Positive score favors AI, negative score favors human
+        Each window is scored by a table lookup on its (AI count, human count),
+        read from the board's per-player bitmasks
+        """
+        windows, table = self.get_evaluation_table(board.size)
+        ai_stones = board.masks[2]
+        human_stones = board.masks[1]
+        
+        score = 0
+        for window in windows:
+            score += table[(ai_stones & window).bit_count()][(human_stones & window).bit_count()]
+        return score
+    
+    def get_evaluation_table(self, board_size):
+        """
+        Return (windows, table) for a board size, built once and cached
+        windows: bitmask of every winning line on the board
+        table[ai_count][human_count]: evaluate_window score for a window with those counts
+        """
+        rules = get_rules(board_size)
+        win_length = rules.win_length
+        key = (board_size, win_length)
+        if key not in _EVALUATION_TABLES:
+            table = [[0] * (win_length + 1) for _ in range(win_length + 1)]
+            for ai_count in range(win_length + 1):
+                for human_count in range(win_length + 1 - ai_count):
+                    window = [2] * ai_count + [1] * human_count + [0] * (win_length - ai_count - human_count)
+                    table[ai_count][human_count] = self.evaluate_window(window, win_length)
+            _EVALUATION_TABLES[key] = (rules.line_masks, table)
+        return _EVALUATION_TABLES[key]
+    
+    def evaluate_board_scan(self, board):
+        """
+        Evaluate the current board state by building and counting every window
+        Reference version of evaluate_board, kept for benchmarks
         """
         score = 0
         board_state = board.board
         board_size = board.size
+        rules = get_rules(board_size)
         
-        # Determine win length based on board size
-        if board_size == 3:
-            win_length = 3
-        elif board_size == 5:
-            win_length = 4
-        else:  # 9×9 or 11×11
-            win_length = 5
-        
-        # Check rows, columns, and diagonals for potential wins
-        for row in range(board_size):
-            for col in range(board_size - win_length + 1):
-                window = [board_state[row][col+i] for i in range(win_length)]
-                score += self.evaluate_window(window, win_length)
-
-        for row in range(board_size - win_length + 1):
-            for col in range(board_size):
-                window = [board_state[row+i][col] for i in range(win_length)]
-                score += self.evaluate_window(window, win_length)
-        
-        for row in range(board_size - win_length + 1):
-            for col in range(board_size - win_length + 1):
-                window = [board_state[row+i][col+i] for i in range(win_length)]
-                score += self.evaluate_window(window, win_length)
-        
-        for row in range(win_length - 1, board_size):
-            for col in range(board_size - win_length + 1):
-                window = [board_state[row-i][col+i] for i in range(win_length)]
-                score += self.evaluate_window(window, win_length)
+        # Every winning line (rows, columns and diagonals) is one window
+        for line in rules.lines:
+            window = [board_state[cell // board_size][cell % board_size] for cell in line]
+            score += self.evaluate_window(window, rules.win_length)
         
         return score
     
@@ -189,23 +533,7 @@ class AI:
             elif human_count == 1 and empty_count == 2:
                 score -= 10  # Human has a good opportunity (block!)
         
-        elif win_length == 4:
-            # 5×5 board scoring
-            if ai_count == 3 and empty_count == 1:
-                score += 50  # AI is one move away from winning
-            elif ai_count == 2 and empty_count == 2:
-                score += 10  # AI has a good opportunity
-            elif ai_count == 1 and empty_count == 3:
-                score += 5  # AI has some potential
-            
-            if human_count == 3 and empty_count == 1:
-                score -= 50  # Human is one move away from winning (block!)
-            elif human_count == 2 and empty_count == 2:
-                score -= 10  # Human has a good opportunity (block!)
-            elif human_count == 1 and empty_count == 3:
-                score -= 5  # Human has some potential (block!)
-        
-        else:  # win_length == 5 (9×9 or 11×11 board)
+        else:  # win_length == 5 (5×5 or larger board)
             if ai_count == 4 and empty_count == 1:
                 score += 50  # AI is one move away from winning
             elif ai_count == 3 and empty_count == 2:
@@ -0,0 +1,185 @@
+import atexit
+import copy
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+
+
+def _run_search(ai, board, game_logic):
+    """
+    Run one AI move on copies of the game
+    Returns (move, ai, elapsed seconds, error message or None)
+    """
+    start = time.perf_counter()
+    try:
+        move = ai.make_move(board, game_logic)
+        return move, ai, time.perf_counter() - start, None
+    except Exception as search_error:
+        return None, ai, time.perf_counter() - start, str(search_error)
+
+
+def _process_main(jobs, results):
+    """
+    Loop of the worker process: take pickled (search_id, ai, board, game_logic) jobs
+    and put pickled (search_id, move, ai, elapsed, error) results
+    Both are pickled here rather than in the queues' feeder threads, so a failure
+    is reported as an error result instead of leaving the GUI waiting
+    """
+    while True:
+        search_id, ai, board, game_logic = pickle.loads(jobs.get())
+        result = (search_id,) + _run_search(ai, board, game_logic)
+        try:
+            results.put(pickle.dumps(result))
+        except Exception as pickle_error:
+            results.put(pickle.dumps((search_id, result[1], None, result[3], str(pickle_error))))
+
+
+class AIWorker:
+    """
+    Runs AI moves away from the Tk thread, one search at a time
+    The AI, board and game logic are copied for every search, so the GUI can keep
+    drawing and resetting while it runs. By default the search runs in a separate
+    process (so it does not compete with Tk for the GIL), kept alive between moves
+    and killed to cancel a search; a thread is used when no process can be started
+    or use_process is False. The GUI calls poll() from root.after until it returns
+    the move
+    """
+    def __init__(self):
+        self.use_process = True
+        self.search_id = 0
+        self.pending = None  # (search_id, ai, attributes sent) of the running search
+
+        # Worker process and its queues, started on first use
+        self.process = None
+        self.jobs = None
+        self.results = None
+
+        # Results of thread searches land here
+        self.thread_results = queue.Queue()
+
+    def start_process(self):
+        """
+        Start the worker process; spawned so it never inherits the Tk GUI
+        It is not a daemon, so MCTSAI can still start its own search processes in it
+        """
+        context = multiprocessing.get_context("spawn")
+        self.jobs = context.Queue()
+        self.results = context.Queue()
+        self.process = context.Process(target=_process_main, args=(self.jobs, self.results))
+        self.process.start()
+
+        # multiprocessing joins the process at exit; registering afterwards makes
+        # shutdown run first (atexit is last in, first out)
+        atexit.unregister(self.shutdown)
+        atexit.register(self.shutdown)
+
+    def prepare(self):
+        """Start the worker process ahead of the first search so that move is not delayed"""
+        if self.use_process and self.process is None:
+            try:
+                self.start_process()
+            except Exception as process_error:
+                print(f"AI worker process unavailable, using a thread: {process_error}")
+                self.use_process = False
+
+    def is_busy(self):
+        """True while a search is running"""
+        return self.pending is not None
+
+    def start(self, ai, board, game_logic):
+        """
+        Start searching for ai's move in the current position
+        Returns the id of the search; a running search is cancelled first
+        """
+        if self.pending is not None:
+            self.cancel()
+        self.search_id += 1
+        self.pending = (self.search_id, ai, dict(vars(ai)))
+
+        self.prepare()
+        if self.use_process:
+            try:
+                self.jobs.put(pickle.dumps((self.search_id, ai, board, game_logic)))
+                return self.search_id
+            except Exception as process_error:
+                print(f"AI worker process error, using a thread: {process_error}")
+                self.use_process = False
+
+        # Copy everything the thread touches so a reset cannot change it mid-search
+        ai, board, game_logic = copy.deepcopy((ai, board, game_logic))
+        search_id = self.search_id
+        thread = threading.Thread(
+            target=lambda: self.thread_results.put((search_id,) + _run_search(ai, board, game_logic)),
+            daemon=True)
+        thread.start()
+        return search_id
+
+    def poll(self):
+        """
+        Check for the result of the running search without blocking
+        Once it is done, the state the search left on its copy of the AI (e.g. the
+        MCTS tree kept for the next move) is copied into the GUI's AI, and
+        (move, elapsed seconds, error message or None) is returned; otherwise None
+        Results of cancelled searches are dropped
+        """
+        if self.pending is None:
+            return None
+
+        while True:
+            try:
+                if self.use_process:
+                    result = pickle.loads(self.results.get_nowait())
+                else:
+                    result = self.thread_results.get_nowait()
+            except queue.Empty:
+                if self.use_process and not self.process.is_alive():
+                    self.process = None
+                    self.pending = None
+                    return None, 0.0, "AI worker process stopped"
+                return None
+
+            search_id, move, searched_ai, elapsed, error = result
+            if search_id == self.pending[0]:
+                _, ai, sent = self.pending
+                self.pending = None
+                if searched_ai is not None:
+                    self.adopt(ai, searched_ai, sent)
+                return move, elapsed, error
+
+    def adopt(self, ai, searched_ai, sent):
+        """
+        Copy the attributes of searched_ai (the searched copy of ai) into ai
+        Attributes reassigned on the GUI side while it ran, such as a new difficulty, are kept
+        """
+        current = vars(ai)
+        for name, value in vars(searched_ai).items():
+            if name not in current or current[name] is sent.get(name):
+                current[name] = value
+
+    def cancel(self):
+        """
+        Stop the running search, if any
+        The worker process is killed (and restarted on the next search); a thread
+        cannot be stopped, so its result is ignored when it arrives
+        """
+        if self.pending is None:
+            return
+        self.pending = None
+        if self.use_process and self.process is not None:
+            self.shutdown()
+
+    def shutdown(self):
+        """Stop the worker process"""
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join(1)
+            self.process = None
+            # A job the process never read would otherwise keep the queue's feeder thread,
+            # and so the exit of this process, waiting for it
+            for process_queue in (self.jobs, self.results):
+                process_queue.cancel_join_thread()
+                process_queue.close()
+            self.jobs = None
+            self.results = None
@@ -0,0 +1,148 @@
+# Multiplier for every animation delay: 1.0 is normal speed, 0.5 twice as fast,
+# and 0 turns animations off (every step runs at once) for benchmarking and batch play
+_TIME_SCALE = 1.0
+
+
+def set_time_scale(scale):
+    """
+    Set the multiplier for every animation delay
+    set_time_scale(0) turns animations off
+    """
+    global _TIME_SCALE
+    _TIME_SCALE = max(0.0, scale)
+
+
+def animations_enabled():
+    """False when animations are off"""
+    return _TIME_SCALE > 0
+
+
+def scaled(delay_ms):
+    """A delay in milliseconds, adjusted for the current speed"""
+    return int(delay_ms * _TIME_SCALE)
+
+
+def blend(start_color, end_color, t):
+    """The '#rrggbb' color a fraction t of the way from start_color to end_color"""
+    start = [int(start_color[i:i + 2], 16) for i in (1, 3, 5)]
+    end = [int(end_color[i:i + 2], 16) for i in (1, 3, 5)]
+    return '#' + ''.join(f'{round(a + (b - a) * t):02x}' for a, b in zip(start, end))
+
+
+class Timeline:
+    """
+    A list of steps run one after another on the Tk event loop with root.after
+    Each step waits delay_ms after the previous one and then calls its action,
+    so an effect such as a flash is a few calls to then() instead of a
+    sleep / update loop. When animations are off, start() runs every step at once
+    """
+    def __init__(self, root, animator=None):
+        self.root = root
+        self.animator = animator
+        self.steps = []  # (delay_ms, action) pairs
+        self.on_done = None
+        self.after_id = None
+        self.running = False
+
+    def then(self, delay_ms, action=None):
+        """Add a step; returns the timeline so steps can be chained"""
+        self.steps.append((delay_ms, action))
+        return self
+
+    def tween(self, duration_ms, frames, update):
+        """
+        Add frames steps spread over duration_ms that call update(t), with t
+        going from 1 / frames up to 1.0
+        """
+        for frame in range(1, frames + 1):
+            self.then(duration_ms / frames, lambda t=frame / frames: update(t))
+        return self
+
+    def start(self, on_done=None):
+        """Run the steps; on_done is called after the last one unless the timeline is cancelled"""
+        self.on_done = on_done
+        self.running = True
+        if self.animator is not None:
+            self.animator.running.append(self)
+
+        if not animations_enabled():
+            for _, action in self.steps:
+                if not self.running:  # An action cancelled the timeline
+                    return self
+                if action is not None:
+                    action()
+            self.finish()
+            return self
+
+        self.schedule(0)
+        return self
+
+    def schedule(self, index):
+        """Wait for step index, or finish after the last step"""
+        if index == len(self.steps):
+            self.finish()
+            return
+        delay_ms = self.steps[index][0]
+        self.after_id = self.root.after(scaled(delay_ms), lambda: self.run_step(index))
+
+    def run_step(self, index):
+        """Call the action of step index and schedule the next one"""
+        self.after_id = None
+        if not self.running:
+            return
+        action = self.steps[index][1]
+        if action is not None:
+            try:
+                action()
+            except Exception as step_error:
+                # A widget may have been destroyed under the animation
+                print(f"Animation step error: {step_error}")
+                self.cancel()
+                return
+        if self.running:
+            self.schedule(index + 1)
+
+    def finish(self):
+        """Mark the timeline done and call on_done"""
+        self.stop()
+        if self.on_done is not None:
+            self.on_done()
+
+    def cancel(self):
+        """Stop the timeline without calling on_done"""
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+        self.stop()
+
+    def stop(self):
+        """Mark the timeline as no longer running"""
+        self.running = False
+        if self.animator is not None and self in self.animator.running:
+            self.animator.running.remove(self)
+
+
+class Animator:
+    """
+    Creates timelines on one Tk root and keeps track of the running ones,
+    so a screen can cancel all its pending effects at once, e.g. on a new game
+    """
+    def __init__(self, root):
+        self.root = root
+        self.running = []
+
+    def timeline(self):
+        """A new, empty timeline"""
+        return Timeline(self.root, self)
+
+    def after(self, delay_ms, action):
+        """Call action after delay_ms (scaled), cancelled along with the animations"""
+        return self.timeline().then(delay_ms, action).start()
+
+    def cancel_all(self):
+        """Cancel every running timeline"""
+        for timeline in list(self.running):
+            timeline.cancel()
@@ -0,0 +1,618 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from board import Board
+from bitboard import BitBoard
+from game_logic import GameLogic
+from ai import AI
+from mcts_ai import MCTSAI
+from rules import get_rules
+import playout
+from playout import random_playout, batch_playout
+
+# Fixed test positions for the search benchmarks: (board size, moves played so far)
+SEARCH_POSITIONS = [
+    (3, []),
+    (3, [(1, 1), (0, 0)]),
+    (5, [(2, 2), (1, 1)]),
+    (5, [(2, 2), (1, 1), (2, 1), (2, 3), (3, 3), (0, 0)]),
+    (5, [(0, 0), (4, 4), (1, 1), (3, 3), (0, 4), (4, 0), (2, 2), (1, 3)]),
+]
+
+
+# Games per position for the batch playout benchmark
+BATCH_PLAYOUTS = 256
+
+# Suite settings: random games / positions per board size, minimax depth, MCTS iterations
+SUITE_GAMES = 200
+SUITE_DEPTH = 3
+SUITE_MCTS_ITERATIONS = 1000
+
+# Minimum seconds measured per sample of a suite benchmark
+SUITE_SAMPLE_TIME = 0.1
+
+# Format of the suite's JSON report
+REPORT_VERSION = 3
+
+
+def make_board(board_class, size):
+    """Create a board of the given class and size the same way main.py does"""
+    board = board_class()
+    board.size = size
+    board.reset()
+    return board
+
+
+def random_games(size, count, seed):
+    """Fixed list of random move orders so every engine replays the same games"""
+    rng = random.Random(seed)
+    cells = [(i, j) for i in range(size) for j in range(size)]
+    games = []
+    for _ in range(count):
+        order = cells[:]
+        rng.shuffle(order)
+        games.append(order)
+    return games
+
+
+def bench_board(board_class, size, games):
+    """
+    Replay each game move by move, querying the board the way AI.minimax does,
+    then undo it back to empty. Returns a dict of timings in seconds
+    """
+    board = make_board(board_class, size)
+    game_logic = GameLogic(board)
+    # BitBoard has its own mask-based win test; the list Board relies on GameLogic
+    check_win = board.has_won if hasattr(board, 'has_won') else game_logic.check_win
+    timings = {'make_undo': 0.0, 'empty_cells': 0.0, 'check_win': 0.0}
+    operations = 0
+
+    for order in games:
+        player = 1
+
+        start = time.perf_counter()
+        for row, col in order:
+            board.make_move(row, col, player)
+            player = 3 - player
+        for row, col in reversed(order):
+            board.undo_move(row, col)
+        timings['make_undo'] += time.perf_counter() - start
+        operations += len(order)
+
+        player = 1
+        for row, col in order:
+            board.make_move(row, col, player)
+            player = 3 - player
+
+            start = time.perf_counter()
+            board.get_empty_cells()
+            timings['empty_cells'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            check_win(1)
+            check_win(2)
+            timings['check_win'] += time.perf_counter() - start
+        board.reset()
+
+    timings['operations'] = operations
+    return timings
+
+
+def run_board_benchmark(sizes, game_count, seed):
+    engines = [("Board", Board), ("BitBoard", BitBoard)]
+    for size in sizes:
+        games = random_games(size, game_count, seed)
+        print(f"\n{size}×{size} board, {game_count} games (seed {seed})")
+        print(f"{'engine':<10}{'make+undo/s':>14}{'empty_cells/s':>16}{'win test/s':>14}")
+        for name, board_class in engines:
+            t = bench_board(board_class, size, games)
+            ops = t['operations']
+            print(f"{name:<10}{ops / t['make_undo']:>14,.0f}"
+                  f"{ops / t['empty_cells']:>16,.0f}"
+                  f"{ops / t['check_win']:>14,.0f}")
+
+
+def build_position(size, moves):
+    """Play the moves through GameLogic and return (board, game_logic)"""
+    board = make_board(Board, size)
+    game_logic = GameLogic(board)
+    for row, col in moves:
+        game_logic.make_move(row, col)
+    return board, game_logic
+
+
+def run_search_benchmark(depth):
+    """
+    Nodes searched and time per move for AI.make_move on the fixed positions,
+    with the transposition table, move ordering and root PVS switched on in turn
+    The root columns split the nodes of the last iteration into those under the
+    first root move (full window) and those under the rest (shared alpha, or null
+    windows with PVS), with the number of null-window re-searches
+    """
+    configurations = [
+        ("plain", False, False, False),
+        ("TT", True, False, False),
+        ("TT+order", True, True, False),
+        ("PVS", True, True, True),
+    ]
+    print(f"\nAI.make_move at depth {depth} (hard difficulty)")
+    print(f"{'position':<10}{'search':>10}{'nodes':>10}{'time ms':>10}{'hits':>8}{'misses':>8}{'collisions':>12}"
+          f"{'root 1st':>10}{'root rest':>11}{'re-search':>11}")
+    totals = {name: 0 for name, *_ in configurations}
+    root_totals = {name: [0, 0] for name, *_ in configurations}
+    for index, (size, moves) in enumerate(SEARCH_POSITIONS):
+        for name, use_tt, use_ordering, use_pvs in configurations:
+            board, game_logic = build_position(size, moves)
+            ai = AI()
+            ai.difficulty = "hard"
+            ai.max_depth = depth
+            ai.use_transposition_table = use_tt
+            ai.use_move_ordering = use_ordering
+            ai.use_root_pvs = use_pvs
+            
+            start = time.perf_counter()
+            ai.make_move(board, game_logic)
+            elapsed = time.perf_counter() - start
+            totals[name] += ai.nodes_searched
+            first_nodes = ai.root_nodes[0][1] if ai.root_nodes else 0
+            rest_nodes = sum(nodes for _, nodes in ai.root_nodes[1:])
+            root_totals[name][0] += first_nodes
+            root_totals[name][1] += rest_nodes
+            
+            stats = ai.transposition_table.stats()
+            print(f"{f'{index} ({size}x{size})':<10}{name:>10}{ai.nodes_searched:>10,}"
+                  f"{elapsed * 1000:>10.1f}{stats['hits']:>8,}{stats['misses']:>8,}{stats['collisions']:>12,}"
+                  f"{first_nodes:>10,}{rest_nodes:>11,}{ai.root_researches:>11,}")
+    
+    print("\nTotal nodes: " + ", ".join(f"{name} {count:,}" for name, count in totals.items()))
+    print("Last iteration, root first / rest: " + ", ".join(
+        f"{name} {first:,} / {rest:,}" for name, (first, rest) in root_totals.items()))
+
+
+def run_mcts_benchmark(seed, workers=1, transpositions=False, profile=False):
+    """
+    MCTS iterations per second on the fixed positions (hard difficulty budget),
+    optionally on the transposition graph, with the expansions it saved
+    profile: also print the share of search time spent in each phase (tree search only)
+    """
+    random.seed(seed)
+    search = "transposition graph" if transpositions else "tree"
+    print(f"\nMCTSAI.make_move (hard difficulty, {search}, {workers} worker process(es))")
+    print(f"{'position':<10}{'iterations':>12}{'time ms':>10}{'iter/s':>12}{'saved':>8}")
+    for index, (size, moves) in enumerate(SEARCH_POSITIONS):
+        board, game_logic = build_position(size, moves)
+        mcts_ai = MCTSAI()
+        mcts_ai.difficulty = "hard"
+        mcts_ai.workers = workers
+        mcts_ai.use_transpositions = transpositions
+        mcts_ai.profile = profile
+        
+        start = time.perf_counter()
+        mcts_ai.make_move(board, game_logic)
+        elapsed = time.perf_counter() - start
+        saved = mcts_ai.move_log[-1]['expansions_saved'] if mcts_ai.move_log else 0
+        print(f"{f'{index} ({size}x{size})':<10}{mcts_ai.iterations:>12,}"
+              f"{elapsed * 1000:>10.1f}{mcts_ai.iterations / elapsed:>12,.0f}{saved:>8,}")
+        phase_total = sum(mcts_ai.phase_times.values())
+        if profile and phase_total:
+            print("          " + "  ".join(f"{phase} {seconds / phase_total:.0%}"
+                                          for phase, seconds in mcts_ai.phase_times.items()))
+
+
+def play_game(players, size):
+    """Play one game between two AIs (indexed by player) and return the winner, None for a draw"""
+    board = make_board(BitBoard, size)
+    game_logic = GameLogic(board)
+    while not game_logic.is_game_over():
+        row, col = players[game_logic.get_current_player()].make_move(board, game_logic)
+        game_logic.make_move(row, col)
+    return game_logic.get_winner()
+
+
+def run_rave_benchmark(sizes, match_count, move_time, seed):
+    """
+    RAVE MCTS against plain MCTS with the same wall-clock time per move,
+    swapping who moves first every game
+    """
+    random.seed(seed)
+    for size in sizes:
+        print(f"\n{size}×{size} board, {match_count} games, {move_time * 1000:.0f} ms per move (seed {seed})")
+        results = {'win': 0, 'draw': 0, 'loss': 0}
+        iterations = {'RAVE': [], 'plain': []}
+        for game in range(match_count):
+            rave_ai = MCTSAI()
+            plain_ai = MCTSAI()
+            for mcts_ai in (rave_ai, plain_ai):
+                mcts_ai.difficulty = None
+                mcts_ai.max_iterations = 10 ** 9  # Time is the only limit
+                mcts_ai.max_time = move_time
+            rave_ai.use_rave = True
+            
+            rave_player = 1 if game % 2 == 0 else 2
+            players = {rave_player: rave_ai, 3 - rave_player: plain_ai}
+            winner = play_game(players, size)
+            if winner is None:
+                results['draw'] += 1
+            elif winner == rave_player:
+                results['win'] += 1
+            else:
+                results['loss'] += 1
+            iterations['RAVE'] += [entry['iterations'] for entry in rave_ai.move_log]
+            iterations['plain'] += [entry['iterations'] for entry in plain_ai.move_log]
+        
+        score = (results['win'] + 0.5 * results['draw']) / match_count
+        print(f"RAVE wins {results['win']}, draws {results['draw']}, losses {results['loss']} (score {score:.1%})")
+        for name, counts in iterations.items():
+            print(f"{name:<6} {sum(counts) / max(1, len(counts)):,.0f} iterations per move")
+
+
+def random_positions(board_class, size, count, seed):
+    """Fixed list of random mid-game positions (both players' marks, no winner check)"""
+    rng = random.Random(seed)
+    cells = [(i, j) for i in range(size) for j in range(size)]
+    positions = []
+    for _ in range(count):
+        board = make_board(board_class, size)
+        rng.shuffle(cells)
+        for index, (row, col) in enumerate(cells[:rng.randrange(len(cells))]):
+            board.make_move(row, col, 1 + index % 2)
+        positions.append(board)
+    return positions
+
+
+def end_positions(board_class, size, count, seed):
+    """
+    Fixed lists of finished boards: count boards filled in a random order, half
+    of them drawn and half won by a player, and the same boards one mark short
+    Returns (full boards, near-full boards)
+    """
+    rng = random.Random(seed)
+    rules = get_rules(size)
+    cells = [(i, j) for i in range(size) for j in range(size)]
+    wanted = {True: count // 2, False: count - count // 2}  # Drawn, won
+    orders = {True: [], False: []}
+    while any(len(orders[drawn]) < wanted[drawn] for drawn in orders):
+        rng.shuffle(cells)
+        masks = [0, 0, 0]
+        for index, (row, col) in enumerate(cells):
+            masks[1 + index % 2] |= 1 << (row * size + col)
+        drawn = not rules.has_won(masks[1]) and not rules.has_won(masks[2])
+        if len(orders[drawn]) < wanted[drawn]:
+            orders[drawn].append(list(cells))
+    
+    full = []
+    near_full = []
+    for order in orders[True] + orders[False]:
+        for boards, moves in ((full, order), (near_full, order[:-1])):
+            board = make_board(board_class, size)
+            for index, (row, col) in enumerate(moves):
+                board.make_move(row, col, 1 + index % 2)
+            boards.append(board)
+    return full, near_full
+
+
+def run_eval_benchmark(sizes, position_count, seed):
+    """Leaf evaluations per second: window scan against the table-driven evaluation"""
+    ai = AI()
+    evaluators = [("scan", ai.evaluate_board_scan), ("table", ai.evaluate_board)]
+    for size in sizes:
+        positions = random_positions(Board, size, position_count, seed)
+        print(f"\n{size}×{size} board, {position_count} positions (seed {seed})")
+        print(f"{'evaluator':<10}{'evals/s':>14}")
+        for name, evaluate in evaluators:
+            start = time.perf_counter()
+            for board in positions:
+                evaluate(board)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<10}{position_count / elapsed:>14,.0f}")
+
+
+def game_logic_playout(board, player):
+    """Rollout the way MCTS used to: rescan the board and play through GameLogic"""
+    game_logic = GameLogic(board)
+    game_logic.set_current_player(player)
+    moves = []
+    while not game_logic.is_game_over():
+        valid_moves = [(r, c) for r in range(board.size) for c in range(board.size) if board.is_cell_empty(r, c)]
+        if not valid_moves:
+            break
+        row, col = random.choice(valid_moves)
+        game_logic.make_move(row, col)
+        moves.append((row, col))
+    for row, col in moves:
+        board.undo_move(row, col)
+    return game_logic.get_winner()
+
+
+def run_playout_benchmark(sizes, position_count, seed):
+    """Random playouts per second from random positions: GameLogic replay against playout.py"""
+    for size in sizes:
+        positions = random_positions(BitBoard, size, position_count, seed)
+        print(f"\n{size}×{size} board, {position_count} positions (seed {seed})")
+        print(f"{'playout':<12}{'playouts/s':>14}")
+        
+        random.seed(seed)
+        start = time.perf_counter()
+        for board in positions:
+            game_logic_playout(board, 1 + board.occupied.bit_count() % 2)
+        elapsed = time.perf_counter() - start
+        print(f"{'GameLogic':<12}{position_count / elapsed:>14,.0f}")
+        
+        random.seed(seed)
+        start = time.perf_counter()
+        for board in positions:
+            random_playout(board.rules, board.masks, board.occupied, 1 + board.occupied.bit_count() % 2)
+        elapsed = time.perf_counter() - start
+        print(f"{'playout':<12}{position_count / elapsed:>14,.0f}")
+        
+        # Batches of BATCH_PLAYOUTS games per position (numpy when installed)
+        start = time.perf_counter()
+        for board in positions:
+            batch_playout(board.rules, board.masks, board.occupied, 1 + board.occupied.bit_count() % 2, BATCH_PLAYOUTS)
+        elapsed = time.perf_counter() - start
+        print(f"{'batch':<12}{position_count * BATCH_PLAYOUTS / elapsed:>14,.0f}")
+
+
+def sample_rate(run):
+    """
+    Operations per second of one sample; run returns (operations, seconds)
+    The sample calls run until it has taken SUITE_SAMPLE_TIME, so short
+    benchmarks are not dominated by timer noise
+    """
+    operations = 0
+    elapsed = 0.0
+    while elapsed < SUITE_SAMPLE_TIME:
+        run_operations, run_elapsed = run()
+        operations += run_operations
+        elapsed += run_elapsed
+    return operations / elapsed
+
+
+def suite_board(size, games):
+    """Timers for Board.make_move / undo_move over whole games, and get_empty_cells after every move"""
+    board = make_board(Board, size)
+    
+    def make_undo():
+        start = time.perf_counter()
+        for order in games:
+            player = 1
+            for row, col in order:
+                board.make_move(row, col, player)
+                player = 3 - player
+            for row, col in reversed(order):
+                board.undo_move(row, col)
+        return sum(2 * len(order) for order in games), time.perf_counter() - start
+    
+    def empty_cells():
+        elapsed = 0.0
+        calls = 0
+        for order in games:
+            player = 1
+            for row, col in order:
+                board.make_move(row, col, player)
+                player = 3 - player
+                start = time.perf_counter()
+                board.get_empty_cells()
+                elapsed += time.perf_counter() - start
+                calls += 1
+            board.reset()
+        return calls, elapsed
+    
+    return {'board.make_undo': make_undo, 'board.get_empty_cells': empty_cells}
+
+
+def suite_game_logic(size, positions, full, near_full):
+    """
+    Timers for GameLogic.check_win (both players) on the mid-game, near-full and
+    full positions, and check_draw on the full ones, drawn and won; on any other
+    board check_draw returns before its win test
+    """
+    game_logics = [GameLogic(board) for board in positions + near_full + full]
+    full_game_logics = [GameLogic(board) for board in full]
+    
+    def check_win():
+        start = time.perf_counter()
+        for game_logic in game_logics:
+            game_logic.check_win(1)
+            game_logic.check_win(2)
+        return 2 * len(game_logics), time.perf_counter() - start
+    
+    def check_draw():
+        start = time.perf_counter()
+        for game_logic in full_game_logics:
+            game_logic.check_draw()
+        return len(full_game_logics), time.perf_counter() - start
+    
+    return {'game_logic.check_win': check_win, 'game_logic.check_draw': check_draw}
+
+
+def suite_evaluation(size, positions):
+    """Timer for AI.evaluate_board on fixed positions"""
+    ai = AI()
+    
+    def evaluate():
+        start = time.perf_counter()
+        for board in positions:
+            ai.evaluate_board(board)
+        return len(positions), time.perf_counter() - start
+    
+    return {'ai.evaluate_board': evaluate}
+
+
+def suite_search(size, seed):
+    """Timers for minimax nodes per second at SUITE_DEPTH and MCTS iterations per second on the fixed positions"""
+    positions = [moves for position_size, moves in SEARCH_POSITIONS if position_size == size]
+    
+    def minimax():
+        nodes = 0
+        elapsed = 0.0
+        for moves in positions:
+            board, game_logic = build_position(size, moves)
+            ai = AI()
+            ai.difficulty = "hard"
+            ai.max_depth = SUITE_DEPTH
+            start = time.perf_counter()
+            ai.make_move(board, game_logic)
+            elapsed += time.perf_counter() - start
+            nodes += ai.nodes_searched
+        return nodes, elapsed
+    
+    def mcts():
+        iterations = 0
+        elapsed = 0.0
+        for moves in positions:
+            board, game_logic = build_position(size, moves)
+            playout.seed(seed)
+            mcts_ai = MCTSAI()
+            mcts_ai.difficulty = None
+            mcts_ai.max_iterations = SUITE_MCTS_ITERATIONS
+            mcts_ai.max_time = 60  # Iterations are the only limit
+            start = time.perf_counter()
+            mcts_ai.make_move(board, game_logic)
+            elapsed += time.perf_counter() - start
+            iterations += mcts_ai.iterations
+        return iterations, elapsed
+    
+    return {'ai.minimax': minimax, 'mcts.iterations': mcts}
+
+
+def run_suite(sizes, seed, repeat):
+    """
+    Run every suite benchmark on fixed games, positions and seeds for each board size
+    Returns the report: {'results': {'<benchmark>/<size>x<size>': operations per second}, ...}
+    The benchmarks are sampled in repeat rounds, one sample of each per round, and
+    each rate is the median of its samples: a slow spell of the machine lands in one
+    sample of many benchmarks rather than every sample of one, and the median drops it
+    """
+    timers = {}
+    for size in sizes:
+        games = random_games(size, SUITE_GAMES, seed)
+        positions = random_positions(Board, size, SUITE_GAMES, seed)
+        full, near_full = end_positions(Board, size, SUITE_GAMES, seed)
+        size_timers = {}
+        size_timers.update(suite_board(size, games))
+        size_timers.update(suite_game_logic(size, positions, full, near_full))
+        size_timers.update(suite_evaluation(size, positions))
+        size_timers.update(suite_search(size, seed))
+        for name, run in size_timers.items():
+            timers[f"{name}/{size}x{size}"] = run
+    
+    samples = {key: [] for key in timers}
+    for round_index in range(repeat):
+        print(f"\rRound {round_index + 1}/{repeat}", end="", file=sys.stderr)
+        for key, run in timers.items():
+            samples[key].append(sample_rate(run))
+    print(file=sys.stderr)
+    
+    results = {}
+    print(f"{'benchmark':<32}{'ops/s':>14}")
+    for key, rates in samples.items():
+        results[key] = statistics.median(rates)
+        print(f"{key:<32}{results[key]:>14,.0f}")
+    
+    return {
+        'version': REPORT_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare_reports(baseline, current, threshold):
+    """
+    Print the change of every rate against the baseline report
+    Returns the benchmarks that got slower by more than threshold (a fraction, e.g. 0.1)
+    """
+    regressions = []
+    print(f"\n{'benchmark':<32}{'baseline':>14}{'current':>14}{'change':>9}")
+    for key, current_rate in current['results'].items():
+        baseline_rate = baseline['results'].get(key)
+        if not baseline_rate:
+            print(f"{key:<32}{'-':>14}{current_rate:>14,.0f}{'new':>9}")
+            continue
+        change = current_rate / baseline_rate - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<32}{baseline_rate:>14,.0f}{current_rate:>14,.0f}{change:>+9.1%}{flag}")
+    
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) more than {threshold:.0%} slower than the baseline")
+    else:
+        print(f"\nNo benchmark more than {threshold:.0%} slower than the baseline")
+    return regressions
+
+
+def load_report(path):
+    """Read a suite report written with --report"""
+    with open(path) as report_file:
+        report = json.load(report_file)
+    if report.get('version') != REPORT_VERSION:
+        raise ValueError(f"{path} is not a version {REPORT_VERSION} benchmark report")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the board, rules and AI hot paths")
+    parser.add_argument("benchmark", choices=["board", "search", "eval", "mcts", "playout", "rave", "suite", "compare"],
+                        help="which benchmark to run; suite runs the fixed hot path set, compare checks two suite reports")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 5], help="board sizes to test")
+    parser.add_argument("--games", type=int, default=2000, help="number of random games or positions to use")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for the game list")
+    parser.add_argument("--depth", type=int, default=3, help="search depth for the search benchmark")
+    parser.add_argument("--workers", type=int, default=1, help="search processes for the mcts benchmark")
+    parser.add_argument("--transpositions", action="store_true", help="mcts benchmark on the transposition graph")
+    parser.add_argument("--profile", action="store_true", help="mcts benchmark: time spent in each search phase")
+    parser.add_argument("--matches", type=int, default=100, help="games per board size for the rave benchmark")
+    parser.add_argument("--move-time", type=float, default=0.005,
+                        help="seconds per move for the rave benchmark (short, or every game is a draw)")
+    parser.add_argument("--report", help="suite: write the JSON report here; compare: the report to check")
+    parser.add_argument("--baseline", help="suite / compare: report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="slowdown against the baseline that counts as a regression (0.3 = 30%%); "
+                             "keep it above the change between runs of the same code on the machine")
+    parser.add_argument("--repeat", type=int, default=5, help="suite: rounds of samples per benchmark, the median counts")
+    args = parser.parse_args()
+
+    if args.benchmark in ("suite", "compare"):
+        if args.benchmark == "compare" and not (args.baseline and args.report):
+            parser.error("compare needs --baseline and --report")
+        try:
+            baseline = load_report(args.baseline) if args.baseline else None
+            if args.benchmark == "compare":
+                report = load_report(args.report)
+            else:
+                report = run_suite(args.sizes, args.seed, args.repeat)
+                if args.report:
+                    with open(args.report, "w") as report_file:
+                        json.dump(report, report_file, indent=2)
+        except (OSError, ValueError) as report_error:
+            print(f"Benchmark report error: {report_error}")
+            sys.exit(2)
+        # A regression fails the run, so the suite can gate a change
+        if baseline is not None and compare_reports(baseline, report, args.threshold):
+            sys.exit(1)
+    elif args.benchmark == "board":
+        run_board_benchmark(args.sizes, args.games, args.seed)
+    elif args.benchmark == "search":
+        run_search_benchmark(args.depth)
+    elif args.benchmark == "eval":
+        run_eval_benchmark(args.sizes, args.games, args.seed)
+    elif args.benchmark == "mcts":
+        run_mcts_benchmark(args.seed, args.workers, args.transpositions, args.profile)
+    elif args.benchmark == "playout":
+        run_playout_benchmark(args.sizes, args.games, args.seed)
+    elif args.benchmark == "rave":
+        run_rave_benchmark(args.sizes, args.matches, args.move_time, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from board import get_zobrist_keys
+from rules import get_rules
+
+
+class BitBoard:
+    """
+    Board engine that stores each player's stones as one integer bitmask
+    Cell (row, col) is bit row * size + col. Keeps the Board API so GameLogic,
+    AI and MCTSAI can run on it unchanged, with O(1) make_move / undo_move
+    """
+    def __init__(self):
+        self.size = 5
+        self.reset()
+
+    def make_move(self, row, col, player):
+        """
+        Make a move on the board
+        player: 1 for human (X), 2 for AI (O)
+        Returns True if move is valid, False otherwise
+        """
+        if 0 <= row < self.size and 0 <= col < self.size:
+            bit = 1 << (row * self.size + col)
+            if not self.occupied & bit:
+                self.masks[player] |= bit
+                self.occupied |= bit
+
+                # Update the hash: add the mark and pass the turn
+                self.hash ^= self.zobrist_keys[player][row * self.size + col] ^ self.side_key
+                self.side_to_move = 3 - self.side_to_move
+                return True
+        return False
+
+    def undo_move(self, row, col):
+        """
+        Undo a move (used by AI algorithm)
+        """
+        if 0 <= row < self.size and 0 <= col < self.size:
+            bit = 1 << (row * self.size + col)
+            if self.occupied & bit:
+                player = 1 if self.masks[1] & bit else 2
+                self.masks[player] ^= bit
+                self.occupied ^= bit
+
+                # Remove the mark from the hash and give the turn back, so make + undo
+                # restores the hash even for a move made out of turn
+                self.hash ^= self.zobrist_keys[player][row * self.size + col] ^ self.side_key
+                self.side_to_move = 3 - self.side_to_move
+
+    def set_side_to_move(self, player):
+        """
+        Make player the side to move, updating the hash; for a game that
+        starts with player 2, or any other change of turn outside make_move
+        """
+        if self.side_to_move != player:
+            self.hash ^= self.side_key
+            self.side_to_move = player
+
+    def is_cell_empty(self, row, col):
+        """
+        Check if a cell is empty
+        """
+        return not self.occupied >> (row * self.size + col) & 1
+
+    def get_empty_cells(self):
+        """
+        Return a list of empty cells in row-major order
+        """
+        cells = self.cells
+        empty = self.full_mask & ~self.occupied
+        empty_cells = []
+        while empty:
+            low = empty & -empty
+            empty_cells.append(cells[low.bit_length() - 1])
+            empty ^= low
+        return empty_cells
+
+    @property
+    def empty_cells(self):
+        return self.get_empty_cells()
+
+    def is_board_full(self):
+        """
+        Check if the board is full
+        """
+        return self.occupied == self.full_mask
+
+    def get_cell_state(self, row, col):
+        """
+        Get the state of a cell
+        Returns 0 for empty, 1 for human (X), 2 for AI (O)
+        """
+        bit = 1 << (row * self.size + col)
+        if self.masks[1] & bit:
+            return 1
+        if self.masks[2] & bit:
+            return 2
+        return 0
+
+    @property
+    def board(self):
+        """
+        List-of-lists view of the board for code that indexes board.board directly
+        Built on every access, so hot paths should use the masks instead
+        """
+        return [[self.get_cell_state(row, col) for col in range(self.size)] for row in range(self.size)]
+
+    def has_won(self, player):
+        """
+        Check if the player has completed any winning line
+        """
+        return self.rules.has_won(self.masks[player])
+
+    def wins_through(self, row, col, player):
+        """
+        Check only the lines through (row, col), e.g. right after a move there
+        """
+        stones = self.masks[player]
+        for line in self.rules.cell_line_masks[row * self.size + col]:
+            if stones & line == line:
+                return True
+        return False
+
+    def reset(self):
+        """
+        Reset the board to initial state
+        """
+        size = self.size
+        self.rules = get_rules(size)
+        self.win_length = self.rules.win_length
+
+        self.masks = [0, 0, 0]  # Indexed by player, slot 0 unused
+        self.occupied = 0
+        self.full_mask = (1 << (size * size)) - 1
+        self.cells = [(i, j) for i in range(size) for j in range(size)]
+
+        # Zobrist hash of the position, using the same keys as Board
+        self.zobrist_keys, self.side_key = get_zobrist_keys(size)
+        self.hash = 0
+        self.side_to_move = 1
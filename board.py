@@ -1,8 +1,42 @@
+import random
+
+# Fixed seed so Zobrist hashes are the same from run to run
+ZOBRIST_SEED = 20250805
+
+# Zobrist keys are generated once per board size and shared by every board
+_ZOBRIST_KEYS = {}
+
+
+def get_zobrist_keys(size):
+    """
+    Return (cell_keys, side_key) for a board size
+    cell_keys[player][row * size + col] is the 64-bit key for that player's mark on that cell,
+    side_key is XORed in while player 2 is to move
+    """
+    if size not in _ZOBRIST_KEYS:
+        rng = random.Random(ZOBRIST_SEED + size)
+        cell_keys = (
+            (),  # Player 0 (empty) has no keys
+            tuple(rng.getrandbits(64) for _ in range(size * size)),
+            tuple(rng.getrandbits(64) for _ in range(size * size)),
+        )
+        _ZOBRIST_KEYS[size] = (cell_keys, rng.getrandbits(64))
+    return _ZOBRIST_KEYS[size]
+
+
 class Board:
     def __init__(self):
         self.size = 5
         self.board = [[0 for _ in range(self.size)] for _ in range(self.size)]
         self.empty_cells = [(i, j) for i in range(self.size) for j in range(self.size)]
+        
+        # One bitmask per player (bit row * size + col), same layout as BitBoard
+        self.masks = [0, 0, 0]
+
+        # Zobrist hash of the position, updated incrementally by make_move / undo_move
+        self.zobrist_keys, self.side_key = get_zobrist_keys(self.size)
+        self.hash = 0
+        self.side_to_move = 1
     
     def make_move(self, row, col, player):
         """
@@ -15,6 +49,11 @@ class Board:
             # Safely remove from empty_cells if it exists
             if (row, col) in self.empty_cells:
                 self.empty_cells.remove((row, col))
+            self.masks[player] |= 1 << (row * self.size + col)
+            
+            # Update the hash: add the mark and pass the turn
+            self.hash ^= self.zobrist_keys[player][row * self.size + col] ^ self.side_key
+            self.side_to_move = 3 - self.side_to_move
             return True
         return False
     
@@ -23,11 +62,27 @@ class Board:
         Undo a move (used by AI algorithm)
         """
         if 0 <= row < self.size and 0 <= col < self.size and self.board[row][col] != 0:
+            player = self.board[row][col]
             self.board[row][col] = 0
+            self.masks[player] &= ~(1 << (row * self.size + col))
+            
+            # Remove the mark from the hash and give the turn back, so make + undo
+            # restores the hash even for a move made out of turn
+            self.hash ^= self.zobrist_keys[player][row * self.size + col] ^ self.side_key
+            self.side_to_move = 3 - self.side_to_move
             # Only add to empty_cells if it's not already there
             if (row, col) not in self.empty_cells:
                 self.empty_cells.append((row, col))
     
+    def set_side_to_move(self, player):
+        """
+        Make player the side to move, updating the hash; for a game that
+        starts with player 2, or any other change of turn outside make_move
+        """
+        if self.side_to_move != player:
+            self.hash ^= self.side_key
+            self.side_to_move = player
+    
     def is_cell_empty(self, row, col):
         """
         Check if a cell is empty
@@ -48,7 +103,8 @@ class Board:
         
         # Update the empty_cells list to match the actual board state
         self.empty_cells = actual_empty_cells
-        return self.empty_cells
+        # Return a copy: callers iterate this list while make_move / undo_move edit empty_cells
+        return list(self.empty_cells)
     
     def is_board_full(self):
         """
@@ -68,4 +124,8 @@ class Board:
         Reset the board to initial state
         """
         self.board = [[0 for _ in range(self.size)] for _ in range(self.size)]
-        self.empty_cells = [(i, j) for i in range(self.size) for j in range(self.size)]
\ No newline at end of file
+        self.empty_cells = [(i, j) for i in range(self.size) for j in range(self.size)]
+        self.masks = [0, 0, 0]
+        self.zobrist_keys, self.side_key = get_zobrist_keys(self.size)
+        self.hash = 0
+        self.side_to_move = 1
\ No newline at end of file
@@ -1,11 +1,12 @@
 import tkinter as tk
-import time
 from tkinter import font as tkfont
+from animation import Timeline, scaled
 
 class BoardSizeScreen:
     def __init__(self, root, callback):
         self.root = root
         self.callback = callback  # Function to call with selected board size
+        self.selected = False  # Set by the first click on a choice
         
         # Modern color scheme (matching the existing screens)
         self.bg_color = '#0f0f1a'  # Deep blue-black
@@ -117,13 +118,13 @@ class BoardSizeScreen:
         self.buttons_frame.pack_forget()
         
         # Fade in title
-        self.root.after(200, lambda: self.fade_in_widget(self.title_label, 0))
+        self.root.after(scaled(200), lambda: self.fade_in_widget(self.title_label, 0))
         
         # Fade in subtitle after title
-        self.root.after(800, lambda: self.fade_in_widget(self.subtitle_label, 0))
+        self.root.after(scaled(800), lambda: self.fade_in_widget(self.subtitle_label, 0))
         
         # Fade in buttons after subtitle
-        self.root.after(1400, lambda: self.fade_in_widget(self.buttons_frame, 0))
+        self.root.after(scaled(1400), lambda: self.fade_in_widget(self.buttons_frame, 0))
     
     def fade_in_widget(self, widget, alpha=0):
         """Fade in a widget gradually"""
@@ -152,24 +153,25 @@ class BoardSizeScreen:
                 widget.configure(fg=new_color)
             
             # Schedule next fade step
-            self.root.after(30, lambda: self.fade_in_widget(widget, alpha))
+            self.root.after(scaled(30), lambda: self.fade_in_widget(widget, alpha))
     
     def select_size(self, size):
         """Handle board size selection with animation"""
+        # Only the first choice counts; the screen is on its way out
+        if self.selected:
+            return
+        self.selected = True
+        
         # Flash effect on selected button
         button = next(b for b, s in self.size_buttons if s["name"] == size["name"])
         
-        # Animate selection
+        # Animate selection, then fade out
+        timeline = Timeline(self.root)
         for _ in range(3):
-            button.config(bg=self.accent_color)
-            self.root.update()
-            time.sleep(0.05)
-            button.config(bg=size["color"])
-            self.root.update()
-            time.sleep(0.05)
-        
-        # Fade out effect
-        self.fade_out(size)
+            timeline.then(0, lambda: button.config(bg=self.accent_color))
+            timeline.then(50, lambda: button.config(bg=size["color"]))
+            timeline.then(50)
+        timeline.start(lambda: self.fade_out(size))
     
     def fade_out(self, selected_size, alpha=1.0):
         """Create a fade out effect before transitioning"""
@@ -184,7 +186,7 @@ class BoardSizeScreen:
                     new_color = f'#{int(r*alpha):02x}{int(g*alpha):02x}{int(b*alpha):02x}'
                     widget.configure(fg=new_color)
             
-            self.root.after(30, lambda: self.fade_out(selected_size, alpha))
+            self.root.after(scaled(30), lambda: self.fade_out(selected_size, alpha))
         else:
             # Destroy board size selection screen widgets and call the callback with selected size
             for widget in self.main_frame.winfo_children():
@@ -1,12 +1,14 @@
 import tkinter as tk
-import time
 import random
 from tkinter import font as tkfont
+from animation import Timeline, scaled
+from ai import DIFFICULTY_TIME_LIMITS
 
 class DifficultyScreen:
     def __init__(self, root, callback):
         self.root = root
         self.callback = callback  # Function to call with selected difficulty
+        self.selected = False  # Set by the first click on a choice
         
         # Modern color scheme
         self.bg_color = '#0f0f1a'  # Deep blue-black
@@ -61,11 +63,14 @@ class DifficultyScreen:
     def create_difficulty_buttons(self):
         """Create stylish difficulty selection buttons"""
         difficulties = [
-            {"name": "EASY", "color": self.easy_color, "hover": "#66bb6a", "value": "easy", "depth": 1,
+            {"name": "EASY", "color": self.easy_color, "hover": "#66bb6a", "value": "easy",
+             "time_limit": DIFFICULTY_TIME_LIMITS["easy"],
              "description": "For casual play and beginners"},
-            {"name": "MEDIUM", "color": self.medium_color, "hover": "#ffa726", "value": "medium", "depth": 3,
+            {"name": "MEDIUM", "color": self.medium_color, "hover": "#ffa726", "value": "medium",
+             "time_limit": DIFFICULTY_TIME_LIMITS["medium"],
              "description": "Balanced challenge for most players"},
-            {"name": "HARD", "color": self.hard_color, "hover": "#ef5350", "value": "hard", "depth": 5,
+            {"name": "HARD", "color": self.hard_color, "hover": "#ef5350", "value": "hard",
+             "time_limit": DIFFICULTY_TIME_LIMITS["hard"],
              "description": "For experienced players seeking a challenge"}
         ]
         
@@ -116,13 +121,13 @@ class DifficultyScreen:
         self.buttons_frame.pack_forget()
         
         # Fade in title
-        self.root.after(200, lambda: self.fade_in_widget(self.title_label, 0))
+        self.root.after(scaled(200), lambda: self.fade_in_widget(self.title_label, 0))
         
         # Fade in subtitle after title
-        self.root.after(800, lambda: self.fade_in_widget(self.subtitle_label, 0))
+        self.root.after(scaled(800), lambda: self.fade_in_widget(self.subtitle_label, 0))
         
         # Fade in buttons after subtitle
-        self.root.after(1400, lambda: self.fade_in_widget(self.buttons_frame, 0))
+        self.root.after(scaled(1400), lambda: self.fade_in_widget(self.buttons_frame, 0))
     
     def fade_in_widget(self, widget, alpha=0):
         """Fade in a widget gradually"""
@@ -151,24 +156,25 @@ class DifficultyScreen:
                 widget.configure(fg=new_color)
             
             # Schedule next fade step
-            self.root.after(30, lambda: self.fade_in_widget(widget, alpha))
+            self.root.after(scaled(30), lambda: self.fade_in_widget(widget, alpha))
     
     def select_difficulty(self, difficulty):
         """Handle difficulty selection with animation"""
+        # Only the first choice counts; the screen is on its way out
+        if self.selected:
+            return
+        self.selected = True
+        
         # Flash effect on selected button
         button = next(b for b, d in self.difficulty_buttons if d["name"] == difficulty["name"])
         
-        # Animate selection
+        # Animate selection, then fade out
+        timeline = Timeline(self.root)
         for _ in range(3):
-            button.config(bg=self.accent_color)
-            self.root.update()
-            time.sleep(0.05)
-            button.config(bg=difficulty["color"])
-            self.root.update()
-            time.sleep(0.05)
-        
-        # Fade out effect
-        self.fade_out(difficulty)
+            timeline.then(0, lambda: button.config(bg=self.accent_color))
+            timeline.then(50, lambda: button.config(bg=difficulty["color"]))
+            timeline.then(50)
+        timeline.start(lambda: self.fade_out(difficulty))
     
     def fade_out(self, selected_difficulty, alpha=1.0):
         """Create a fade out effect before transitioning"""
@@ -183,7 +189,7 @@ class DifficultyScreen:
                     new_color = f'#{int(r*alpha):02x}{int(g*alpha):02x}{int(b*alpha):02x}'
                     widget.configure(fg=new_color)
             
-            self.root.after(30, lambda: self.fade_out(selected_difficulty, alpha))
+            self.root.after(scaled(30), lambda: self.fade_out(selected_difficulty, alpha))
         else:
             # Destroy difficulty screen widgets and call the callback with selected difficulty
             for widget in self.main_frame.winfo_children():
@@ -191,4 +197,4 @@ class DifficultyScreen:
             self.main_frame.destroy()
             
             # Call callback with difficulty info
-            self.callback(selected_difficulty["value"], selected_difficulty["depth"])
+            self.callback(selected_difficulty["value"], selected_difficulty["time_limit"])
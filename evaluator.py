@@ -0,0 +1,103 @@
+class IncrementalEvaluator:
+    """
+    Evaluation score kept up to date move by move
+    The evaluation windows are the winning lines of the board's rules, so one
+    set of counters serves both: (AI count, human count) for every line, the
+    running total of their table scores, and how many lines each player has
+    completed. place() and remove() only touch the lines through the cell,
+    so reading the score or checking for a win is O(1)
+    """
+    def __init__(self, board, table, rules):
+        self.size = board.size
+        self.table = table
+        self.win_length = rules.win_length
+        self.cell_lines = rules.cell_lines
+
+        line_count = len(rules.lines)
+        self.ai_counts = [0] * line_count
+        self.human_counts = [0] * line_count
+        self.line_counts = [None, self.human_counts, self.ai_counts]  # Indexed by player
+        self.score = table[0][0] * line_count
+        self.completed_lines = [0, 0, 0]  # Winning lines filled by each player
+
+        # Load the marks already on the board
+        for row in range(board.size):
+            for col in range(board.size):
+                player = board.get_cell_state(row, col)
+                if player != 0:
+                    self.place(row, col, player)
+
+    def place(self, row, col, player):
+        """
+        Update the counters for a mark placed at (row, col)
+        """
+        cell = row * self.size + col
+        table = self.table
+        ai_counts = self.ai_counts
+        human_counts = self.human_counts
+        win_length = self.win_length
+        score = self.score
+
+        if player == 2:
+            for line in self.cell_lines[cell]:
+                ai_count = ai_counts[line]
+                human_count = human_counts[line]
+                score += table[ai_count + 1][human_count] - table[ai_count][human_count]
+                ai_counts[line] = ai_count + 1
+                if ai_count + 1 == win_length:
+                    self.completed_lines[2] += 1
+        else:
+            for line in self.cell_lines[cell]:
+                ai_count = ai_counts[line]
+                human_count = human_counts[line]
+                score += table[ai_count][human_count + 1] - table[ai_count][human_count]
+                human_counts[line] = human_count + 1
+                if human_count + 1 == win_length:
+                    self.completed_lines[1] += 1
+        self.score = score
+
+    def remove(self, row, col, player):
+        """
+        Update the counters for the mark at (row, col) being taken back
+        """
+        cell = row * self.size + col
+        table = self.table
+        ai_counts = self.ai_counts
+        human_counts = self.human_counts
+        win_length = self.win_length
+        score = self.score
+
+        if player == 2:
+            for line in self.cell_lines[cell]:
+                ai_count = ai_counts[line]
+                human_count = human_counts[line]
+                score += table[ai_count - 1][human_count] - table[ai_count][human_count]
+                ai_counts[line] = ai_count - 1
+                if ai_count == win_length:
+                    self.completed_lines[2] -= 1
+        else:
+            for line in self.cell_lines[cell]:
+                ai_count = ai_counts[line]
+                human_count = human_counts[line]
+                score += table[ai_count][human_count - 1] - table[ai_count][human_count]
+                human_counts[line] = human_count - 1
+                if human_count == win_length:
+                    self.completed_lines[1] -= 1
+        self.score = score
+
+    def has_won(self, player):
+        """
+        Check if the player has completed a winning line
+        """
+        return self.completed_lines[player] > 0
+
+    def is_winning_move(self, row, col, player):
+        """
+        Check if the player would complete a winning line by playing the empty cell (row, col)
+        """
+        line_counts = self.line_counts[player]
+        target = self.win_length - 1
+        for line in self.cell_lines[row * self.size + col]:
+            if line_counts[line] == target:
+                return True
+        return False
@@ -1,59 +1,75 @@
+from rules import get_rules
+
+
 class GameLogic:
     def __init__(self, board):
         self.board = board
         self.current_player = 1  
         self.game_over = False
         self.winner = None
+        self.last_move = None
+        self.winning_cells = []
+        # Only check the lines through the last move instead of scanning the whole board
+        self.incremental_win_check = True
+    
+    def get_rules(self):
+        """
+        Winning lines for the current board size
+        """
+        return get_rules(self.board.size)
+    
+    def get_win_length(self):
+        """
+        Number of marks in a row needed to win on the current board size
+        """
+        return self.get_rules().win_length
     
     def check_win(self, player):
         """
         Check if the specified player has won
-        Win condition depends on board size:
+        Win condition depends on board size (see rules.get_win_length):
         - 3×3 board: 3 in a row
-        - 5×5 board: 4 in a row
-        - 9×9 or larger: 5 in a row
+        - 5×5 or larger: 5 in a row
         """
-        board_size = self.board.size
-        board_state = self.board.board
-        
-        # Determine win length based on board size
-        if board_size == 3:
-            win_length = 3
-        elif board_size == 5:
-            win_length = 5  # Changed from 4 to 5 as per requirement
-        else:  # 9×9 or 11×11
-            win_length = 5
-        
-        # Check horizontal wins
-        for row in range(board_size):
-            for col in range(board_size - win_length + 1):
-                if all(board_state[row][col+i] == player for i in range(win_length)):
-                    return True
-        
-        # Check vertical wins
-        for row in range(board_size - win_length + 1):
-            for col in range(board_size):
-                if all(board_state[row+i][col] == player for i in range(win_length)):
-                    return True
-        
-        # Check diagonal wins (top-left to bottom-right)
-        for row in range(board_size - win_length + 1):
-            for col in range(board_size - win_length + 1):
-                if all(board_state[row+i][col+i] == player for i in range(win_length)):
-                    return True
-        
-        # Check diagonal wins (bottom-left to top-right)
-        for row in range(win_length - 1, board_size):
-            for col in range(board_size - win_length + 1):
-                if all(board_state[row-i][col+i] == player for i in range(win_length)):
-                    return True
-        
+        return self.get_rules().has_won(self.board.masks[player])
+    
+    def check_win_at(self, row, col, player):
+        """
+        Check only the lines through (row, col) for the specified player
+        Returns the winning cells, or an empty list if there is no win through this cell
+        """
+        if self.board.get_cell_state(row, col) != player:
+            return []
+        return self.line_through(row, col, player)
+    
+    def is_winning_move(self, row, col, player):
+        """
+        Check if the player would win by playing the empty cell (row, col)
+        The board is not changed
+        """
+        cell = row * self.board.size + col
+        stones = self.board.masks[player] | (1 << cell)
+        for mask in self.get_rules().cell_line_masks[cell]:
+            if stones & mask == mask:
+                return True
         return False
     
+    def line_through(self, row, col, player):
+        """
+        Find a winning line through (row, col), counting (row, col) itself as
+        the player's mark whatever it holds
+        Returns the cells of the line, or an empty list
+        """
+        cell = row * self.board.size + col
+        return self.get_rules().winning_line(self.board.masks[player] | (1 << cell), cell)
+    
     def check_draw(self):
         """
         Check if the game is a draw
         """
+        if self.incremental_win_check and self.last_move is not None:
+            # A win can only come from the last move, and make_move already recorded it
+            return self.board.is_board_full() and not self.winning_cells
         return self.board.is_board_full() and not self.check_win(1) and not self.check_win(2)
     
     def make_move(self, row, col):
@@ -65,8 +81,18 @@ class GameLogic:
             return False
         
         if self.board.make_move(row, col, self.current_player):
+            self.last_move = (row, col)
+            
             # Check if the current player has won
-            if self.check_win(self.current_player):
+            if self.incremental_win_check:
+                self.winning_cells = self.check_win_at(row, col, self.current_player)
+                won = bool(self.winning_cells)
+            else:
+                won = self.check_win(self.current_player)
+                if won:
+                    self.winning_cells = self.check_win_at(row, col, self.current_player)
+            
+            if won:
                 self.game_over = True
                 self.winner = self.current_player
             # Check if the game is a draw
@@ -88,6 +114,14 @@ class GameLogic:
         """
         return self.current_player
     
+    def set_current_player(self, player):
+        """
+        Set whose turn it is, e.g. to let the AI open the game
+        The board's side to move (and so its hash) follows
+        """
+        self.current_player = player
+        self.board.set_side_to_move(player)
+    
     def is_game_over(self):
         """
         Check if the game is over
@@ -101,6 +135,12 @@ class GameLogic:
         """
         return self.winner
     
+    def get_winning_cells(self):
+        """
+        Get the cells of the winning line, or an empty list if nobody has won
+        """
+        return self.winning_cells
+    
     def reset(self):
         """
         Reset the game to initial state
@@ -108,4 +148,6 @@ class GameLogic:
         self.board.reset()
         self.current_player = 1
         self.game_over = False
-        self.winner = None
\ No newline at end of file
+        self.winner = None
+        self.last_move = None
+        self.winning_cells = []
\ No newline at end of file
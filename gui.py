@@ -1,9 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
-import time
 import random
 from tkinter import font as tkfont
 import math
+from ai import DIFFICULTY_TIME_LIMITS
+from ai_worker import AIWorker
+from animation import Animator, blend, scaled
+
+# Milliseconds between checks for the result of the AI's search
+AI_POLL_INTERVAL_MS = 20
 
 class GUI:
     def __init__(self, root, board, game_logic, ai, second_ai=None):
@@ -50,7 +55,11 @@ class GUI:
             'current_game_time': 0
         }
         
-        self.current_move_start_time = 0
+        # Runs the AI searches in the background so the window keeps responding
+        self.ai_worker = AIWorker()
+        # Runs the effects and delays on the event loop; a new game cancels the pending ones
+        self.animator = Animator(root)
+        self.ai_worker.prepare()
         
         self.root.configure(bg=self.bg_color)
         self.root.resizable(True, True)
@@ -156,7 +165,7 @@ class GUI:
         self.reset_button.pack(side=tk.LEFT, padx=15)
         
         
-        self.difficulty_level = 3  
+        self.difficulty_level = "medium"  
         self.difficulty_button = tk.Button(self.button_frame, text="DIFFICULTY: MEDIUM", 
                                          font=self.status_font, command=self.change_difficulty,
                                          bg=self.accent_color, fg=self.text_color, 
@@ -169,7 +178,7 @@ class GUI:
         
         # If in AI vs AI mode, start the game automatically after a short delay
         if self.ai_vs_ai_mode:
-            self.root.after(1500, self.make_ai_move)
+            self.animator.after(1500, self.make_ai_move)
     
     def pulse_status_label(self):
         """Create a pulsing effect for the status label"""
@@ -205,17 +214,18 @@ class GUI:
     
     def change_difficulty(self):
         """Change AI difficulty level with visual feedback"""
-        levels = [(1, "EASY", "#4caf50"), (3, "MEDIUM", "#ff9800"), (5, "HARD", "#f44336")]
+        levels = [("easy", "EASY", "#4caf50"), ("medium", "MEDIUM", "#ff9800"), ("hard", "HARD", "#f44336")]
         current_index = next((i for i, (level, _, _) in enumerate(levels) if level == self.difficulty_level), 0)
         next_index = (current_index + 1) % len(levels)
         self.difficulty_level, difficulty_name, color = levels[next_index]
         
-        self.ai.max_depth = self.difficulty_level
-        self.ai.difficulty = difficulty_name.lower()
+        self.ai.time_limit = DIFFICULTY_TIME_LIMITS[self.difficulty_level]
+        self.ai.max_depth = None
+        self.ai.difficulty = self.difficulty_level
         
         original_bg = self.difficulty_button["bg"]
         self.difficulty_button.config(bg=color)
-        self.root.after(200, lambda: self.difficulty_button.config(bg=self.accent_color))
+        self.root.after(scaled(200), lambda: self.difficulty_button.config(bg=self.accent_color))
         
         self.difficulty_button.config(text=f"DIFFICULTY: {difficulty_name}")
     
@@ -223,29 +233,21 @@ class GUI:
         """Highlight the winning cells with animation"""
         if not self.winning_cells:
             return
-            
-        def animate_cell(index):
-            if index < len(self.winning_cells):
-                row, col = self.winning_cells[index]
-                button = self.buttons[row][col]
-                
-                # Flash effect
-                for i in range(3):
-                    button.config(bg=self.win_line_color)
-                    self.root.update()
-                    time.sleep(0.05)
-                    button.config(bg=self.btn_color)
-                    self.root.update()
-                    time.sleep(0.05)
-                
-               
-                button.config(bg=self.win_line_color)
-                
-                
-                self.root.after(100, lambda: animate_cell(index + 1))
         
+        timeline = self.animator.timeline()
+        for row, col in self.winning_cells:
+            button = self.buttons[row][col]
+            
+            # Flash effect
+            for i in range(3):
+                timeline.then(0, lambda button=button: button.config(bg=self.win_line_color))
+                timeline.then(50, lambda button=button: button.config(bg=self.btn_color))
+                timeline.then(50)
+            
+            timeline.then(0, lambda button=button: button.config(bg=self.win_line_color))
+            timeline.then(100)
         
-        animate_cell(0)
+        timeline.start()
     
     def handle_button_click(self, row, col):
         """
@@ -260,109 +262,68 @@ class GUI:
         
         if self.game_logic.make_move(row, col):
           
-            self.animate_move(row, col, "X", self.human_color)
-            
-            if self.game_logic.is_game_over():
-                self.find_winning_cells()
-                self.highlight_winning_cells()
-                self.show_game_result()
-                return
-            
+            self.animate_move(row, col, "X", self.human_color, on_done=self.after_human_move)
+    
+    def after_human_move(self):
+        """End the game or let the AI reply, once the human's move has been drawn"""
+        if self.game_logic.is_game_over():
+            self.find_winning_cells()
+            self.highlight_winning_cells()
+            self.show_game_result()
+            return
         
-            self.animate_thinking()
-            self.root.update() 
-            
-            self.root.after(random.randint(300, 800))
-            
-            self.make_ai_move()
+        # Think for a moment before searching, so the reply does not appear instantly
+        self.animate_thinking(
+            on_done=lambda: self.animator.after(random.randint(300, 800), self.make_ai_move))
     
-    def animate_thinking(self):
+    def animate_thinking(self, on_done=None):
         """Animate the AI thinking status with dots"""
         dots = [".  ", ".. ", "..."]
+        timeline = self.animator.timeline()
         for i in range(3):
-            self.status_label.config(text=f"AI IS THINKING{dots[i]}", fg=self.ai_color)
-            self.root.update()
-            time.sleep(0.2)
+            timeline.then(0, lambda i=i: self.status_label.config(text=f"AI IS THINKING{dots[i]}", fg=self.ai_color))
+            timeline.then(200)
+        timeline.start(on_done)
     
-    def animate_move(self, row, col, symbol, color):
-        """Animate a move with enhanced visual effects"""
+    def animate_move(self, row, col, symbol, color, on_done=None):
+        """
+        Animate a move with enhanced visual effects
+        Runs on the event loop; on_done is called once the symbol is shown
+        """
         button = self.buttons[row][col]
         button.config(text="", state=tk.DISABLED)
         
-       
+        timeline = self.animator.timeline()
         for i in range(5):
-            size = i * 0.2
-            alpha = 1.0 - (i * 0.2)
-            button.config(bg=color)
-            self.root.update()
-            time.sleep(0.05)
-            button.config(bg=self.btn_color)
-            self.root.update()
-            time.sleep(0.02)
-        
-        for opacity in range(0, 11, 2):
-           
-            opacity_factor = opacity / 10.0
-            button.config(text=symbol, disabledforeground=color, bg=self.btn_color)
-            self.root.update()
-            time.sleep(0.03)
+            timeline.then(0, lambda: button.config(bg=color))
+            timeline.then(50, lambda: button.config(bg=self.btn_color))
+            timeline.then(20)
         
+        # Fade the symbol in
+        timeline.tween(180, 6, lambda t: button.config(text=symbol, disabledforeground=blend(self.btn_color, color, t),
+                                                       bg=self.btn_color))
         
-        button.config(text=symbol, disabledforeground=color, bg=self.btn_color)
+        timeline.then(0, lambda: button.config(text=symbol, disabledforeground=color, bg=self.btn_color))
+        timeline.start(on_done)
     
     def find_winning_cells(self):
         """Find the cells that form the winning line"""
-        self.winning_cells = []
+        # GameLogic records the winning line when the winning move is made
+        self.winning_cells = list(self.game_logic.get_winning_cells())
         winner = self.game_logic.get_winner()
-        if winner is None:  
-            return
-            
-        board_size = self.board.size
-        board_state = self.board.board
-        
-        # Determine win length based on board size
-        if board_size == 3:
-            win_length = 3
-        elif board_size == 5:
-            win_length = 5  # Changed from 4 to 5 as per requirement
-        else:  # 9×9 or 11×11
-            win_length = 5
-        
-        # Check horizontal wins
-        for row in range(board_size):
-            for col in range(board_size - win_length + 1):
-                if all(board_state[row][col+i] == winner for i in range(win_length)):
-                    self.winning_cells = [(row, col+i) for i in range(win_length)]
-                    return
-        
-        # Check vertical wins
-        for row in range(board_size - win_length + 1):
-            for col in range(board_size):
-                if all(board_state[row+i][col] == winner for i in range(win_length)):
-                    self.winning_cells = [(row+i, col) for i in range(win_length)]
-                    return
-        
-        # Check diagonal wins (top-left to bottom-right)
-        for row in range(board_size - win_length + 1):
-            for col in range(board_size - win_length + 1):
-                if all(board_state[row+i][col+i] == winner for i in range(win_length)):
-                    self.winning_cells = [(row+i, col+i) for i in range(win_length)]
-                    return
-        
-        # Check diagonal wins (bottom-left to top-right)
-        for row in range(win_length - 1, board_size):
-            for col in range(board_size - win_length + 1):
-                if all(board_state[row-i][col+i] == winner for i in range(win_length)):
-                    self.winning_cells = [(row-i, col+i) for i in range(win_length)]
-                    return
+        if not self.winning_cells and winner:
+            # Fall back to searching the shared line index for the winner's marks
+            rules = self.game_logic.get_rules()
+            self.winning_cells = rules.winning_line(self.board.masks[winner])
     
     def make_ai_move(self):
         """
-        Make a move for the AI with enhanced error handling and resource management
+        Start the AI's search for the current player in the background
+        poll_ai_move picks up the result, so the window stays responsive meanwhile
         """
         try:
-            # Check if game is already over to prevent unnecessary processing
-            if self.game_logic.is_game_over():
+            # Check if game is already over, or a search is already running, to prevent unnecessary processing
+            if self.game_logic.is_game_over() or self.ai_worker.is_busy():
                 return
                 
             current_player = self.game_logic.get_current_player()
@@ -372,36 +333,74 @@ class GUI:
                 # In AI vs AI mode, player 1 uses minimax AI and player 2 uses MCTS AI
                 current_ai = self.ai if current_player == 1 else self.second_ai
                 ai_name = "MINIMAX" if current_player == 1 else "MCTS"
+            else:
+                # In Human vs AI mode, only player 2 (AI) makes moves here
+                current_ai = self.ai
+                ai_name = "AI"
+            color = self.human_color if current_player == 1 else self.ai_color
+            
+            # Update status to show which AI is thinking
+            self.status_label.config(text=f"{ai_name} IS THINKING...", fg=color)
+            
+            # Search on copies of the game in the worker, and check for the move with after()
+            self.ai_worker.start(current_ai, self.board, self.game_logic)
+            self.root.after(AI_POLL_INTERVAL_MS, self.poll_ai_move)
+        except Exception as e:
+            print(f"Error in make_ai_move: {e}")
+            # Try to recover and continue the game
+            if self.ai_vs_ai_mode and not self.game_logic.is_game_over():
+                try:
+                    # Schedule another attempt after a delay with reduced frequency
+                    self.root.after(1500, self.make_ai_move)
+                except Exception as recovery_error:
+                    print(f"Recovery attempt failed: {recovery_error}")
+    
+    def poll_ai_move(self):
+        """
+        Check whether the AI's search has finished, and play its move if it has
+        Reschedules itself while the search runs; stops once it was cancelled
+        """
+        result = self.ai_worker.poll()
+        if result is None:
+            if self.ai_worker.is_busy():
+                self.root.after(AI_POLL_INTERVAL_MS, self.poll_ai_move)
+            return
+        
+        ai_move, move_time, search_error = result
+        self.finish_ai_move(ai_move, move_time, search_error)
+    
+    def finish_ai_move(self, ai_move, move_time, search_error=None):
+        """
+        Play the move the AI's search returned, with enhanced error handling and resource management
+        move_time: seconds the search took; search_error: message if the search failed
+        """
+        try:
+            # The game may have ended or been reset while the AI was thinking
+            if self.game_logic.is_game_over():
+                return
+                
+            current_player = self.game_logic.get_current_player()
+            
+            # Determine how to show the move based on the current player and game mode
+            if self.ai_vs_ai_mode:
+                ai_name = "MINIMAX" if current_player == 1 else "MCTS"
                 symbol = "X" if current_player == 1 else "O"
                 color = self.human_color if current_player == 1 else self.ai_color
                 next_status = "MCTS'S TURN" if current_player == 1 else "MINIMAX'S TURN"
-                
-                # Start timing the AI move
-                self.current_move_start_time = time.time()
             else:
-                # In Human vs AI mode, only player 2 (AI) makes moves here
-                current_ai = self.ai
                 ai_name = "AI"
                 symbol = "O"
                 color = self.ai_color
                 next_status = "YOUR TURN"
             
-            # Update status to show which AI is thinking
-            self.status_label.config(text=f"{ai_name} IS THINKING...", fg=color)
-            self.root.update()
-            
-            # Get the AI's move with enhanced error handling
+            # Check the AI's move with enhanced error handling
             try:
-                # Add a small delay to prevent UI freezing and reduce CPU usage
-                self.root.after(50)
-                self.root.update()
-                
-                # Get AI move with a timeout mechanism
-                ai_row, ai_col = current_ai.make_move(self.board, self.game_logic)
+                if search_error is not None or ai_move is None:
+                    raise RuntimeError(search_error or "no move returned")
+                ai_row, ai_col = ai_move
                 
                 # If in AI vs AI mode, record the move time
                 if self.ai_vs_ai_mode:
-                    move_time = time.time() - self.current_move_start_time
                     metrics = self.minimax_metrics if current_player == 1 else self.mcts_metrics
                     
                     # Update metrics
@@ -455,49 +454,15 @@ class GUI:
             if self.game_logic.make_move(ai_row, ai_col):
                 # Animate the move with error handling
                 try:
-                    self.animate_move(ai_row, ai_col, symbol, color)
+                    self.animate_move(ai_row, ai_col, symbol, color,
+                                      on_done=lambda: self.after_ai_move(current_player, next_status))
                 except Exception as anim_error:
                     print(f"Animation error: {anim_error}")
                     # Update the button directly if animation fails
                     self.buttons[ai_row][ai_col].config(text=symbol, disabledforeground=color, bg=self.btn_color, state=tk.DISABLED)
-                
-                # Check if the game is over
-                if self.game_logic.is_game_over():
-                    try:
-                        self.find_winning_cells()
-                        self.highlight_winning_cells()
-                        self.show_game_result()
-                    except Exception as end_error:
-                        print(f"Game end handling error: {end_error}")
-                        # Simple fallback for game end
-                        winner = self.game_logic.get_winner()
-                        winner_text = "MINIMAX WINS!" if winner == 1 else "MCTS WINS!" if winner == 2 else "DRAW!"
-                        self.status_label.config(text=winner_text)
-                else:
-                    # Update status for next player
-                    self.status_label.config(text=next_status, fg=self.human_color if current_player == 2 else self.ai_color)
-                    
-                    # If in AI vs AI mode, schedule the next AI move after a delay
-                    if self.ai_vs_ai_mode:
-                        try:
-                            # Add a thinking animation for the next AI
-                            next_ai_name = "MCTS" if current_player == 1 else "MINIMAX"
-                            self.status_label.config(text=f"{next_ai_name} IS THINKING...", 
-                                                   fg=self.ai_color if current_player == 1 else self.human_color)
-                            self.root.update()
-                            
-                            # Use a shorter delay to reduce resource usage
-                            # Schedule the next AI move with a delay for better visualization
-                            self.root.after(800, self.make_ai_move)
-                        except Exception as schedule_error:
-                            print(f"Error scheduling next AI move: {schedule_error}")
-                            # Try a simpler approach if the normal scheduling fails
-                            try:
-                                self.root.after(1000, self.make_ai_move)
-                            except:
-                                print("Critical error in AI scheduling")
+                    self.after_ai_move(current_player, next_status)
         except Exception as e:
-            print(f"Error in make_ai_move: {e}")
+            print(f"Error in finish_ai_move: {e}")
             # Try to recover and continue the game
             if self.ai_vs_ai_mode and not self.game_logic.is_game_over():
                 try:
@@ -511,6 +476,45 @@ class GUI:
                     except:
                         pass
     
+    def after_ai_move(self, current_player, next_status):
+        """
+        End the game or hand over to the next player, once the AI's move has been drawn
+        current_player: the player the AI moved for; next_status: status text for the next turn
+        """
+        # Check if the game is over
+        if self.game_logic.is_game_over():
+            try:
+                self.find_winning_cells()
+                self.highlight_winning_cells()
+                self.show_game_result()
+            except Exception as end_error:
+                print(f"Game end handling error: {end_error}")
+                # Simple fallback for game end
+                winner = self.game_logic.get_winner()
+                winner_text = "MINIMAX WINS!" if winner == 1 else "MCTS WINS!" if winner == 2 else "DRAW!"
+                self.status_label.config(text=winner_text)
+        else:
+            # Update status for next player
+            self.status_label.config(text=next_status, fg=self.human_color if current_player == 2 else self.ai_color)
+            
+            # If in AI vs AI mode, schedule the next AI move after a delay
+            if self.ai_vs_ai_mode:
+                try:
+                    # Add a thinking animation for the next AI
+                    next_ai_name = "MCTS" if current_player == 1 else "MINIMAX"
+                    self.status_label.config(text=f"{next_ai_name} IS THINKING...", 
+                                           fg=self.ai_color if current_player == 1 else self.human_color)
+                    
+                    # Schedule the next AI move with a delay for better visualization
+                    self.animator.after(800, self.make_ai_move)
+                except Exception as schedule_error:
+                    print(f"Error scheduling next AI move: {schedule_error}")
+                    # Try a simpler approach if the normal scheduling fails
+                    try:
+                        self.root.after(1000, self.make_ai_move)
+                    except:
+                        print("Critical error in AI scheduling")
+    
     def show_game_result(self):
         """
         Show the game result with enhanced visuals
@@ -707,6 +711,10 @@ class GUI:
         Reset the game with improved error handling
         """
         try:
+            # Drop the search and the pending effects of the old game
+            self.ai_worker.cancel()
+            self.animator.cancel_all()
+            
             # Reset game state
             self.game_logic.reset()
             self.winning_cells = []
@@ -718,31 +726,17 @@ class GUI:
                 self.mcts_metrics['current_game_moves'] = 0
                 self.mcts_metrics['current_game_time'] = 0
             
-            # Reset board UI with reduced animations to prevent freezing
-            try:
-                for row in range(self.board.size):
-                    for col in range(self.board.size):
-                        self.buttons[row][col].config(text="", state=tk.NORMAL, bg=self.btn_color)
-                        # Update less frequently to reduce resource usage
-                        if (row * self.board.size + col) % 3 == 0:
-                            self.root.update()
-                            time.sleep(0.005)  # Reduced delay
-            except Exception as ui_error:
-                print(f"Error resetting UI: {ui_error}")
-                # Fallback: reset all buttons at once
-                for row in range(self.board.size):
-                    for col in range(self.board.size):
-                        self.buttons[row][col].config(text="", state=tk.NORMAL, bg=self.btn_color)
-            
-            # Final UI update
-            self.root.update()
+            # Reset board UI at once, so every cell is clickable as soon as the new game starts
+            for row in range(self.board.size):
+                for col in range(self.board.size):
+                    self.buttons[row][col].config(text="", state=tk.NORMAL, bg=self.btn_color)
             
             if self.ai_vs_ai_mode:
                 try:
                     # In AI vs AI mode, always start with player 1 (Minimax AI)
                     self.status_label.config(text="MINIMAX'S TURN", fg=self.human_color)
                     # Use after() instead of direct call to prevent stack overflow
-                    self.root.after(800, self.make_ai_move)  # Start AI vs AI game automatically with reduced delay
+                    self.animator.after(800, self.make_ai_move)  # Start AI vs AI game automatically with reduced delay
                 except Exception as ai_start_error:
                     print(f"Error starting AI vs AI mode: {ai_start_error}")
             else:
@@ -751,18 +745,18 @@ class GUI:
                     # In Human vs AI mode, randomly decide who goes first
                     if random.random() < 0.5:
                         # Human goes first
-                        self.game_logic.current_player = 1
+                        self.game_logic.set_current_player(1)
                         self.status_label.config(text="YOUR TURN", fg=self.human_color)
                     else:
                         # AI goes first
-                        self.game_logic.current_player = 2
+                        self.game_logic.set_current_player(2)
                         self.status_label.config(text="AI'S TURN", fg=self.ai_color)
                         # Schedule AI move after a short delay
-                        self.root.after(800, self.make_ai_move)
+                        self.animator.after(800, self.make_ai_move)
                 except Exception as human_ai_error:
                     print(f"Error setting up Human vs AI mode: {human_ai_error}")
                     # Fallback to human first
-                    self.game_logic.current_player = 1
+                    self.game_logic.set_current_player(1)
                     self.status_label.config(text="YOUR TURN", fg=self.human_color)
         except Exception as e:
             print(f"Critical error in reset_game: {e}")
@@ -0,0 +1,180 @@
+import argparse
+import ast
+import json
+import sys
+import time
+
+from board import Board
+from bitboard import BitBoard
+from game_logic import GameLogic
+from ai import AI
+from mcts_ai import MCTSAI
+import playout
+
+# Engine types and the attributes they get before any set in the engine spec
+ENGINE_TYPES = {
+    "minimax": (AI, {"difficulty": "hard", "max_depth": 3, "time_limit": None}),
+    "mcts": (MCTSAI, {"difficulty": None, "max_iterations": 1000, "max_time": 1.0}),
+}
+
+BOARD_TYPES = {"board": Board, "bitboard": BitBoard}
+
+
+def parse_engine(spec):
+    """
+    Parse an engine spec such as "minimax:max_depth=4" or "mcts:max_time=0.5,use_rave=True"
+    The part before the colon is the engine type; each name=value pair is an
+    attribute set on the engine, with the value read as a Python literal when it is one
+    Returns a dict with the spec itself as 'name', the 'type' and its 'settings'
+    """
+    engine_type, _, settings_text = spec.partition(":")
+    if engine_type not in ENGINE_TYPES:
+        raise ValueError(f"Unknown engine type '{engine_type}' (expected one of {', '.join(ENGINE_TYPES)})")
+
+    settings = {}
+    for pair in filter(None, settings_text.split(",")):
+        name, _, value = pair.partition("=")
+        try:
+            settings[name.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            settings[name.strip()] = value.strip()
+    return {'name': spec, 'type': engine_type, 'settings': settings}
+
+
+def create_engine(engine):
+    """Build a fresh engine from a parse_engine dict"""
+    engine_class, defaults = ENGINE_TYPES[engine['type']]
+    instance = engine_class()
+    for name, value in {**defaults, **engine['settings']}.items():
+        if not hasattr(instance, name):
+            raise ValueError(f"{engine_class.__name__} has no setting '{name}'")
+        setattr(instance, name, value)
+    return instance
+
+
+def move_stats(instance):
+    """Search statistics an engine leaves after a move, for the move records"""
+    if isinstance(instance, AI):
+        return {'nodes': instance.nodes_searched, 'depth': instance.completed_depth}
+    return {'iterations': instance.iterations}
+
+
+def play_game(engines, size, seed, board_class=Board, on_move=None):
+    """
+    Play one game between two engines (parse_engine dicts, indexed by player)
+    Both engines are built fresh and the random generators seeded with seed, so a
+    game with depth or iteration budgets replays exactly
+    on_move(record) is called with a dict for every move
+    Returns a dict with the winner (1, 2 or None for a draw), the moves and the per-move times
+    """
+    playout.seed(seed)
+    board = board_class()
+    board.size = size
+    board.reset()
+    game_logic = GameLogic(board)
+    players = [None, create_engine(engines[1]), create_engine(engines[2])]
+
+    moves = []
+    move_times = {1: [], 2: []}
+    start = time.perf_counter()
+    while not game_logic.is_game_over():
+        player = game_logic.get_current_player()
+        move_start = time.perf_counter()
+        row, col = players[player].make_move(board, game_logic)
+        move_time = time.perf_counter() - move_start
+        if not game_logic.make_move(row, col):
+            raise RuntimeError(f"{engines[player]['name']} played an illegal move ({row}, {col})")
+
+        moves.append((row, col))
+        move_times[player].append(move_time)
+        if on_move is not None:
+            record = {'type': 'move', 'ply': len(moves), 'player': player, 'engine': engines[player]['name'],
+                      'move': [row, col], 'time_ms': round(move_time * 1000, 3)}
+            record.update(move_stats(players[player]))
+            on_move(record)
+
+    return {
+        'winner': game_logic.get_winner(),
+        'moves': moves,
+        'move_times': move_times,
+        'time_s': time.perf_counter() - start,
+    }
+
+
+def run_games(engines, game_count, size, seed, alternate=True, board_class=Board, output=sys.stdout):
+    """
+    Play game_count games back to back and write one JSON line per move and per game
+    Game i is seeded with seed + i; with alternate, the engines swap sides every game
+    Returns the score table: wins, draws and losses per engine
+    """
+    results = {engine['name']: {'win': 0, 'draw': 0, 'loss': 0} for engine in engines}
+    for game in range(game_count):
+        first, second = engines if not alternate or game % 2 == 0 else engines[::-1]
+        game_engines = {1: first, 2: second}
+        game_seed = seed + game
+
+        def write_move(record):
+            record['game'] = game
+            output.write(json.dumps(record) + "\n")
+
+        outcome = play_game(game_engines, size, game_seed, board_class, write_move)
+        winner = outcome['winner']
+        output.write(json.dumps({
+            'type': 'game', 'game': game, 'seed': game_seed, 'size': size,
+            'engines': {'1': first['name'], '2': second['name']},
+            'winner': winner, 'winner_engine': game_engines[winner]['name'] if winner else None,
+            'moves': len(outcome['moves']), 'time_s': round(outcome['time_s'], 4),
+        }) + "\n")
+        output.flush()
+
+        for player, engine in game_engines.items():
+            if winner is None:
+                results[engine['name']]['draw'] += 1
+            elif winner == player:
+                results[engine['name']]['win'] += 1
+            else:
+                results[engine['name']]['loss'] += 1
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play AI vs AI games without a display and write the moves and results as JSON lines",
+        epilog="Engine specs are a type and optional attributes, e.g. minimax:max_depth=4 or "
+               "mcts:max_iterations=2000,max_time=1.0,use_rave=True")
+    parser.add_argument("--first", default="minimax", help="engine that plays X in the first game")
+    parser.add_argument("--second", default="mcts", help="engine that plays O in the first game")
+    parser.add_argument("--games", type=int, default=10, help="number of games to play")
+    parser.add_argument("--size", type=int, default=3, help="board size")
+    parser.add_argument("--seed", type=int, default=1234, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--no-alternate", action="store_true", help="keep the engines on the same side every game")
+    parser.add_argument("--board", choices=sorted(BOARD_TYPES), default="board", help="board implementation")
+    parser.add_argument("--output", default="-", help="JSON lines file to write, - for stdout")
+    args = parser.parse_args()
+
+    try:
+        engines = [parse_engine(args.first), parse_engine(args.second)]
+        for engine in engines:
+            create_engine(engine)  # Check the settings before any game starts
+    except ValueError as spec_error:
+        parser.error(str(spec_error))
+    if engines[0]['name'] == engines[1]['name']:
+        # Self-play: tell the two copies apart in the records
+        engines[0]['name'] += " #1"
+        engines[1]['name'] += " #2"
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        results = run_games(engines, args.games, args.size, args.seed, not args.no_alternate,
+                            BOARD_TYPES[args.board], output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    # The summary goes to stderr so stdout stays pure JSON lines
+    for name, score in results.items():
+        print(f"{name}: {score['win']} wins, {score['draw']} draws, {score['loss']} losses", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
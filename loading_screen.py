@@ -2,6 +2,7 @@ import tkinter as tk
 import time
 import random
 from tkinter import font as tkfont
+from animation import scaled
 import math
 
 class LoadingScreen:
@@ -196,11 +197,11 @@ class LoadingScreen:
             self.progress_text.config(text=f"{loading_texts[text_index]}{dots}")
             
             # Schedule next animation frame
-            self.root.after(30, self.animate_loading)
+            self.root.after(scaled(30), self.animate_loading)
         else:
             # Loading complete
             self.progress_text.config(text="Ready!")
-            self.root.after(500, self.finish_loading)
+            self.root.after(scaled(500), self.finish_loading)
     
     def finish_loading(self):
         """Finish the loading process and transition to the next screen"""
@@ -221,7 +222,7 @@ class LoadingScreen:
                     new_color = f'#{int(r*alpha):02x}{int(g*alpha):02x}{int(b*alpha):02x}'
                     widget.configure(fg=new_color)
             
-            self.root.after(30, lambda: self.fade_out(alpha))
+            self.root.after(scaled(30), lambda: self.fade_out(alpha))
         else:
             # Destroy loading screen widgets and call the callback
             for widget in self.main_frame.winfo_children():
@@ -1,15 +1,28 @@
+import argparse
 import tkinter as tk
 from board import Board
 from game_logic import GameLogic
-from ai import AI
+from ai import AI, DIFFICULTY_TIME_LIMITS
 from mcts_ai import MCTSAI
 from gui import GUI
 from loading_screen import LoadingScreen
 from difficulty_screen import DifficultyScreen
 from mode_selection_screen import ModeSelectionScreen
 from board_size_screen import BoardSizeScreen
+import animation
 
 def main():
+    parser = argparse.ArgumentParser(description="Tic Tac Toe against minimax and MCTS AIs")
+    parser.add_argument("--no-animations", action="store_true",
+                        help="skip every animation and delay, e.g. to watch AI vs AI games at full speed")
+    parser.add_argument("--animation-speed", type=float, default=1.0,
+                        help="speed of the animations; 2 is twice as fast")
+    args = parser.parse_args()
+    if args.no_animations:
+        animation.set_time_scale(0)
+    elif args.animation_speed > 0:
+        animation.set_time_scale(1 / args.animation_speed)
+    
     # Initialize the main window
     root = tk.Tk()
     root.title("Modern Tic Tac Toe AI")
@@ -19,7 +32,7 @@ def main():
     board_size = None
     
     # Function to start the game after all selections
-    def start_game(difficulty, depth):
+    def start_game(difficulty, time_limit):
         # Create game components with selected board size
         board = Board()
         board.size = board_size  # Set the selected board size
@@ -31,7 +44,8 @@ def main():
             # Human vs AI mode
             ai = AI()
             ai.difficulty = difficulty
-            ai.max_depth = depth
+            ai.time_limit = time_limit  # Iterative deepening until the time runs out
+            ai.max_depth = None
             
             # Start the game with the selected difficulty
             gui = GUI(root, board, game_logic, ai)
@@ -39,7 +53,8 @@ def main():
             # AI vs AI mode - use medium difficulty to prevent excessive resource usage
             minimax_ai = AI()
             minimax_ai.difficulty = "medium"  # Use medium difficulty to reduce resource usage
-            minimax_ai.max_depth = 3        # Reduced depth to prevent crashes
+            minimax_ai.time_limit = DIFFICULTY_TIME_LIMITS["medium"]  # Same thinking time as MCTS medium
+            minimax_ai.max_depth = None
             
             mcts_ai = MCTSAI()
             mcts_ai.difficulty = "medium"    # Use medium difficulty to reduce resource usage
@@ -60,7 +75,7 @@ def main():
             show_difficulty_screen()
         else:
             # For AI vs AI mode, start the game directly with medium difficulty
-            start_game("medium", 3)
+            start_game("medium", DIFFICULTY_TIME_LIMITS["medium"])
     
     # Function to handle game mode selection
     def handle_mode_selection(mode):
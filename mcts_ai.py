@@ -1,132 +1,598 @@
 import random
 import math
 import time
-from copy import deepcopy
-
-class Node:
-    def __init__(self, board, game_logic, parent=None, move=None):
-        self.board = deepcopy(board)
-        self.game_logic = deepcopy(game_logic)
-        self.parent = parent
-        self.move = move  # The move that led to this state
-        self.children = []
-        self.visits = 0
-        self.wins = 0
-        self.untried_moves = self.get_untried_moves()
-    
-    def get_untried_moves(self):
-        """Get all valid moves that haven't been tried yet"""
-        return self.board.get_empty_cells()
-    
-    def select_child(self):
-        """Select the child with the highest UCB score"""
-        # UCB1 formula: wins/visits + C * sqrt(ln(parent visits) / visits)
-        C = 1.41  # Exploration parameter
-        
-        # Select child with highest UCB score
-        return max(self.children, key=lambda child: 
-                  (child.wins / child.visits if child.visits > 0 else float('inf')) + 
-                  C * math.sqrt(math.log(self.visits) / child.visits if child.visits > 0 else float('inf')))
-    
-    def expand(self):
-        """Expand the tree by adding a new child node"""
-        if not self.untried_moves or self.game_logic.is_game_over():
-            return None
+import atexit
+import multiprocessing
+from array import array
+
+from bitboard import BitBoard
+import playout
+from playout import random_playout, batch_playout
+
+# Nodes are added to MCTSTree in chunks of this many slots
+TREE_CHUNK_SIZE = 4096
+
+# UCB1 exploration parameter
+C = 1.41
+
+# MCTS-Solver results, from the side of the player who moved into a node
+UNPROVEN = 0
+PROVEN_WIN = 1
+PROVEN_LOSS = -1
+PROVEN_DRAW = 2
+
+# Visits at which RAVE weighs a child's own value and its AMAF value about equally
+RAVE_EQUIVALENCE = 300
+
+# UCB exploration parameter with RAVE; the AMAF values already spread the search
+RAVE_EXPLORATION = 0.3
+
+# Iterations between reads of the clock in the search loops
+DEADLINE_CHECK_INTERVAL = 16
+
+# Per-move budget for each difficulty level: (seconds, iteration ceiling)
+# The time is the limit that binds; the ceilings are 50 times the iteration caps
+# of the old deepcopy-based search, about what the search now runs in that time,
+# so only a much faster machine stops at them
+DIFFICULTY_BUDGETS = {
+    "easy": (0.5, 10000),
+    "medium": (1.0, 25000),
+    "hard": (2.0, 50000),
+}
+
+# Worker processes for root-parallel search, kept alive across moves and games
+_WORKER_POOL = None
+_WORKER_POOL_SIZE = 0
+
+
+def get_worker_pool(workers):
+    """
+    Return the shared pool of search processes, starting it on first use
+    Processes are spawned rather than forked so they never inherit the Tk GUI
+    """
+    global _WORKER_POOL, _WORKER_POOL_SIZE
+    if _WORKER_POOL is None or _WORKER_POOL_SIZE != workers:
+        shutdown_worker_pool()
+        _WORKER_POOL = multiprocessing.get_context("spawn").Pool(workers)
+        _WORKER_POOL_SIZE = workers
+    return _WORKER_POOL
+
+
+def shutdown_worker_pool():
+    """Stop the search processes, if they are running"""
+    global _WORKER_POOL, _WORKER_POOL_SIZE
+    if _WORKER_POOL is not None:
+        _WORKER_POOL.terminate()
+        _WORKER_POOL.join()
+        _WORKER_POOL = None
+        _WORKER_POOL_SIZE = 0
+
+
+atexit.register(shutdown_worker_pool)
+
+
+def choose_move(child_stats):
+    """
+    Pick the move to play from (move, visits, wins, proof) of the root's children
+    A proven win comes first; otherwise the most visited move that is not
+    proven lost, falling back to proven losses when nothing else is left
+    """
+    for move, visits, wins, proof in child_stats:
+        if proof == PROVEN_WIN:
+            return move
+    candidates = [stats for stats in child_stats if stats[3] != PROVEN_LOSS] or child_stats
+    return max(candidates, key=lambda stats: stats[1])[0]
+
+
+def _worker_search(job):
+    """
+    Run one independent search in a worker process
+    Returns ([(cell, visits, wins, proof) for each root child], iterations)
+    """
+    (board, current_player, max_iterations, stop_at, playouts_per_leaf,
+     use_rave, rave_equivalence, use_transpositions, use_solver, seed) = job
+    playout.seed(seed)
+    
+    mcts_ai = MCTSAI()
+    state = mcts_ai.copy_board(board)
+    mcts_ai.max_iterations = max_iterations
+    # Search until the wall-clock stop time the parent set; search() stops at 90% of max_time
+    mcts_ai.max_time = max(0.0, stop_at - time.time()) / 0.9
+    mcts_ai.playouts_per_leaf = playouts_per_leaf
+    mcts_ai.use_rave = use_rave
+    mcts_ai.rave_equivalence = rave_equivalence
+    mcts_ai.use_transpositions = use_transpositions
+    mcts_ai.use_solver = use_solver
+    tree, root = mcts_ai.search(state, current_player)
+    return tree.child_stats(root), mcts_ai.iterations
+
+class MCTSTree:
+    """
+    MCTS tree stored as parallel arrays indexed by node id, instead of one
+    Python object per node
+    - visits, wins: statistics, wins counted for the player who moved into the node
+    - parent: parent id, -1 for the root
+    - first_child, child_count: a node's children sit in one contiguous block of
+      ids, reserved when the node is first expanded; child_count of them are in use
+    - move: cell index (row * size + col) of the move into the node
+    - player: the player who made that move
+    - terminal, winner: set when the game is over at the node (winner 0 = draw)
+    - untried: bitmask of the moves not expanded yet
+    - amaf_visits, amaf_wins: all-moves-as-first statistics for RAVE, counting every
+      simulation below the parent in which the node's player played the node's move
+    - proof: MCTS-Solver result for the player who moved into the node
+      (UNPROVEN, PROVEN_WIN, PROVEN_LOSS or PROVEN_DRAW), filled in by solve()
+    The arrays grow by TREE_CHUNK_SIZE slots at a time; reserved counts the
+    slots handed out to child blocks, node_count the nodes actually added
+    """
+    def __init__(self, capacity=TREE_CHUNK_SIZE):
+        self.visits = array('i')
+        self.wins = array('d')
+        self.parent = array('i')
+        self.first_child = array('i')
+        self.child_count = array('h')
+        self.move = array('h')
+        self.player = array('b')
+        self.terminal = array('b')
+        self.winner = array('b')
+        self.amaf_visits = array('i')
+        self.amaf_wins = array('d')
+        self.proof = array('b')
+        self.untried = []  # Bitmasks can be wider than 64 bits, so a plain list
+        self.capacity = 0
+        self.reserved = 0
+        self.node_count = 0
+        self.grow(capacity)
+    
+    def grow(self, count):
+        """Add count empty slots to every array"""
+        self.visits.extend(array('i', [0]) * count)
+        self.wins.extend(array('d', [0.0]) * count)
+        self.parent.extend(array('i', [-1]) * count)
+        self.first_child.extend(array('i', [-1]) * count)
+        self.child_count.extend(array('h', [0]) * count)
+        self.move.extend(array('h', [-1]) * count)
+        self.player.extend(array('b', [0]) * count)
+        self.terminal.extend(array('b', [0]) * count)
+        self.winner.extend(array('b', [0]) * count)
+        self.amaf_visits.extend(array('i', [0]) * count)
+        self.amaf_wins.extend(array('d', [0.0]) * count)
+        self.proof.extend(array('b', [UNPROVEN]) * count)
+        self.untried.extend([0] * count)
+        self.capacity += count
+    
+    def allocate(self, count):
+        """Reserve count consecutive node ids and return the first one"""
+        first = self.reserved
+        while first + count > self.capacity:
+            self.grow(TREE_CHUNK_SIZE)
+        self.reserved += count
+        return first
+    
+    def add_root(self, player, untried):
+        """
+        Add the root node; player is the one who made the last move
+        """
+        root = self.allocate(1)
+        self.node_count += 1
+        self.player[root] = player
+        self.untried[root] = untried
+        return root
+    
+    def select_child(self, node):
+        """
+        Select the child with the highest UCB score, in one pass over its block
+        The exploration constant and log of the parent's visits are folded into
+        one factor per call, and the arrays are indexed in place rather than sliced
+        Children proven lost for the player choosing are skipped and proven
+        draws are valued at exactly 0.5
+        """
+        first = self.first_child[node]
+        visits = self.visits
+        wins = self.wins
+        proof = self.proof
+        sqrt = math.sqrt
+        explore = C * C * math.log(visits[node])  # C * sqrt(log N / n) == sqrt(explore / n)
         
-        try:
-            # Choose a random untried move
-            move = random.choice(self.untried_moves)
-            self.untried_moves.remove(move)
-            
-            # Create a new child node
-            row, col = move
-            new_board = deepcopy(self.board)
-            new_game_logic = deepcopy(self.game_logic)
-            
-            # Make the move - ensure the cell is actually empty in the board state
-            if new_board.is_cell_empty(row, col):
-                new_board.make_move(row, col, new_game_logic.get_current_player())
-                new_game_logic.make_move(row, col)
-                
-                # Create and add the new child node
-                child = Node(new_board, new_game_logic, parent=self, move=move)
-                self.children.append(child)
+        best_child = first
+        best_score = -1.0
+        for child in range(first, first + self.child_count[node]):
+            if proof[child] == PROVEN_LOSS:
+                # Never worth playing; an unproven node always has another child
+                continue
+            child_visits = visits[child]
+            if child_visits == 0:
                 return child
+            value = 0.5 if proof[child] == PROVEN_DRAW else wins[child] / child_visits
+            score = value + sqrt(explore / child_visits)
+            if score > best_score:
+                best_score = score
+                best_child = child
+        return best_child
+    
+    def select_child_rave(self, node, equivalence):
+        """
+        Select the child with the highest RAVE score: the UCT value blended with
+        the AMAF value, weighted by beta = sqrt(equivalence / (3 * visits + equivalence))
+        so AMAF dominates while a child has few visits of its own, plus a smaller
+        exploration term than plain UCB1. Proven losses and draws are handled as in select_child
+        """
+        first = self.first_child[node]
+        visits = self.visits
+        wins = self.wins
+        amaf_visits = self.amaf_visits
+        amaf_wins = self.amaf_wins
+        proof = self.proof
+        sqrt = math.sqrt
+        explore = RAVE_EXPLORATION * RAVE_EXPLORATION * math.log(visits[node])
+        
+        best_child = first
+        best_score = -1.0
+        for child in range(first, first + self.child_count[node]):
+            if proof[child] == PROVEN_LOSS:
+                continue
+            child_visits = visits[child]
+            if child_visits == 0:
+                return child
+            if proof[child] == PROVEN_DRAW:
+                value = 0.5
             else:
-                # If the cell is not empty, remove it from untried_moves and try again
-                return self.expand()
-        except ValueError as e:
-            # If there's an error (like cell not in list), try to recover
-            print(f"Error in MCTS expand: {e}")
-            # Refresh the untried moves list to match the actual board state
-            self.untried_moves = []
-            for r in range(self.board.size):
-                for c in range(self.board.size):
-                    if self.board.is_cell_empty(r, c):
-                        self.untried_moves.append((r, c))
-            
-            # Try expanding again if we have moves
-            if self.untried_moves:
-                return self.expand()
-            return None
+                beta = sqrt(equivalence / (3 * child_visits + equivalence))
+                value = wins[child] / child_visits
+                if amaf_visits[child]:
+                    value = (1 - beta) * value + beta * amaf_wins[child] / amaf_visits[child]
+            score = value + sqrt(explore / child_visits)
+            if score > best_score:
+                best_score = score
+                best_child = child
+        return best_child
     
-    def simulate(self):
-        """Simulate a random game from the current state until the end"""
-        try:
-            # Create copies to avoid modifying the original state
-            sim_board = deepcopy(self.board)
-            sim_game_logic = deepcopy(self.game_logic)
-            
-            # Maximum number of moves to prevent infinite loops
-            max_moves = sim_board.size * sim_board.size
-            move_count = 0
-            
-            # Simulate random moves until the game is over
-            while not sim_game_logic.is_game_over() and move_count < max_moves:
-                # Get all valid moves by checking the actual board state
-                valid_moves = []
-                for r in range(sim_board.size):
-                    for c in range(sim_board.size):
-                        if sim_board.is_cell_empty(r, c):
-                            valid_moves.append((r, c))
-                
-                if not valid_moves:
-                    break
-                
-                # Choose a random move
-                row, col = random.choice(valid_moves)
-                
-                # Make the move with error handling
-                if sim_board.is_cell_empty(row, col):
-                    sim_board.make_move(row, col, sim_game_logic.get_current_player())
-                    sim_game_logic.make_move(row, col)
-                    move_count += 1
-                else:
-                    # Skip this move if the cell is already taken
-                    continue
-            
-            # Return the result of the simulation
-            winner = sim_game_logic.get_winner()
-            return winner
-            
-        except Exception as e:
-            print(f"Error in MCTS simulation: {e}")
-            # Return a default result in case of error
-            return None
+    def expand(self, node, board):
+        """
+        Add a child for a random untried move of node
+        board must hold node's position; the child's move is left played on it
+        """
+        untried = self.untried[node]
+        if not untried or self.terminal[node]:
+            return -1
+        
+        if self.first_child[node] < 0:
+            # First expansion: reserve one slot for every legal move
+            self.first_child[node] = self.allocate(untried.bit_count())
+        
+        # Choose a random untried move: skip a random number of set bits
+        for _ in range(random.randrange(untried.bit_count())):
+            untried &= untried - 1
+        bit = untried & -untried
+        self.untried[node] ^= bit
+        cell = bit.bit_length() - 1
+        
+        child = self.first_child[node] + self.child_count[node]
+        self.child_count[node] += 1
+        self.node_count += 1
+        player = 3 - self.player[node]
+        self.parent[child] = node
+        self.move[child] = cell
+        self.player[child] = player
+        
+        row, col = divmod(cell, board.size)
+        board.make_move(row, col, player)
+        
+        # The game ends at the child if this move wins or fills the board
+        if board.wins_through(row, col, player):
+            self.terminal[child] = 1
+            self.winner[child] = player
+        elif board.is_board_full():
+            self.terminal[child] = 1
+        else:
+            self.untried[child] = board.full_mask & ~board.occupied
+        return child
+    
+    def solve(self, node):
+        """
+        MCTS-Solver: prove node if it is terminal, then carry proofs up the tree
+        A parent is lost for its mover as soon as one child is a proven win (the
+        opponent plays it); once every move is expanded and proven, the parent
+        takes the best outcome its opponent can force
+        """
+        proof = self.proof
+        if self.terminal[node]:
+            proof[node] = PROVEN_WIN if self.winner[node] else PROVEN_DRAW
+        
+        while proof[node] != UNPROVEN:
+            parent = self.parent[node]
+            if parent < 0:
+                return
+            if proof[node] == PROVEN_WIN:
+                proof[parent] = PROVEN_LOSS
+            elif self.untried[parent]:
+                return
+            else:
+                first = self.first_child[parent]
+                children = self.proof[first:first + self.child_count[parent]]
+                if UNPROVEN in children:
+                    return
+                # No child wins for the opponent here, so they settle for a draw if they can
+                proof[parent] = PROVEN_DRAW if PROVEN_DRAW in children else PROVEN_WIN
+            node = parent
+    
+    def backpropagate(self, path, result):
+        """
+        Add the result to every node on path (root first, leaf last)
+        The value is worked out once for the leaf's mover and flips between
+        the two players on the way up
+        """
+        visits = self.visits
+        wins = self.wins
+        if result is None:  # Draw
+            value = 0.5
+        else:
+            value = 1.0 if result == self.player[path[-1]] else 0.0
+        for node in reversed(path):
+            visits[node] += 1
+            wins[node] += value
+            value = 1.0 - value
+    
+    def update_amaf(self, path, result, played):
+        """
+        Add a simulation's result to the AMAF statistics of the children of every node on path
+        played[player]: bitmask of every cell the player filled below the root in it
+        """
+        amaf_visits = self.amaf_visits
+        amaf_wins = self.amaf_wins
+        first_child = self.first_child
+        child_count = self.child_count
+        player = self.player
+        move = self.move
+        for node in path:
+            # Credit each child whose move its player made anywhere later in the simulation
+            first = first_child[node]
+            for child in range(first, first + child_count[node]):
+                child_player = player[child]
+                if played[child_player] >> move[child] & 1:
+                    amaf_visits[child] += 1
+                    if result == child_player:
+                        amaf_wins[child] += 1
+                    elif result is None:  # Draw
+                        amaf_wins[child] += 0.5
+    
+    def backpropagate_batch(self, path, wins, draws, losses):
+        """
+        Add the results of several playouts from the last node on path to every node on it
+        wins and losses are from the side of the player who moved into that node
+        """
+        visits = self.visits
+        node_wins = self.wins
+        total = wins + draws + losses
+        value = wins + 0.5 * draws
+        other = losses + 0.5 * draws
+        for node in reversed(path):
+            visits[node] += total
+            node_wins[node] += value
+            value, other = other, value
+    
+    def find_child(self, node, move):
+        """Id of the child of node reached by move, or -1 if it was not expanded"""
+        first = self.first_child[node]
+        for child in range(first, first + self.child_count[node]):
+            if self.move[child] == move:
+                return child
+        return -1
+    
+    def copy_node(self, source, node, new_node, parent):
+        """Copy node of tree source into new_node of this tree, under parent"""
+        self.visits[new_node] = source.visits[node]
+        self.wins[new_node] = source.wins[node]
+        self.parent[new_node] = parent
+        self.child_count[new_node] = source.child_count[node]
+        self.move[new_node] = source.move[node]
+        self.player[new_node] = source.player[node]
+        self.terminal[new_node] = source.terminal[node]
+        self.winner[new_node] = source.winner[node]
+        self.amaf_visits[new_node] = source.amaf_visits[node]
+        self.amaf_wins[new_node] = source.amaf_wins[node]
+        self.proof[new_node] = source.proof[node]
+        self.untried[new_node] = source.untried[node]
+    
+    def extract(self, node):
+        """
+        Copy the subtree under node into a new tree with node as the root (id 0)
+        Every child block keeps its reserved size, so the copy can keep growing
+        """
+        tree = MCTSTree()
+        root = tree.allocate(1)
+        tree.copy_node(self, node, root, -1)
+        tree.node_count += 1
+        
+        queue = [(node, root)]
+        for old, new in queue:  # The queue grows while it is walked
+            first = self.first_child[old]
+            if first < 0:
+                continue
+            count = self.child_count[old]
+            block = tree.allocate(count + self.untried[old].bit_count())
+            tree.first_child[new] = block
+            for index in range(count):
+                tree.copy_node(self, first + index, block + index, new)
+                queue.append((first + index, block + index))
+            tree.node_count += count
+        return tree
+    
+    def child_stats(self, node):
+        """List of (move, visits, wins, proof) for the expanded children of node"""
+        first = self.first_child[node]
+        return [(self.move[child], self.visits[child], self.wins[child], self.proof[child])
+                for child in range(first, first + self.child_count[node])]
+    
+    def best_move(self, node):
+        """
+        Move of the most visited child of node, or -1 if it has none
+        A proven win is played at once and proven losses only if nothing else is left
+        """
+        if self.child_count[node] == 0:
+            return -1
+        return choose_move(self.child_stats(node))
+
+class MCTSGraph:
+    """
+    MCTS over a DAG: nodes are stored by the Zobrist hash of their position
+    (which includes the side to move), so every move order that reaches a
+    position shares one node and its statistics
+    - visits, wins: node statistics, wins counted for the player who moved into the node
+    - edges[node]: (move, child) for every expanded move out of node
+    - edge_visits[node]: visits through each of those edges, for the exploration term
+    - child_count, untried, player, terminal, winner: as in MCTSTree
+    Backpropagation follows the path walked in the iteration, not parent links,
+    since a node can have several parents
+    expansions_saved counts expanded moves that reached a node already in the graph
+    """
+    def __init__(self):
+        self.index = {}  # Position hash -> node id
+        self.visits = []
+        self.wins = []
+        self.edges = []
+        self.edge_visits = []
+        self.child_count = []
+        self.untried = []
+        self.player = []
+        self.terminal = []
+        self.winner = []
+        self.expansions_saved = 0
+    
+    @property
+    def node_count(self):
+        return len(self.visits)
     
-    def backpropagate(self, result):
-        """Backpropagate the result up the tree"""
-        self.visits += 1
+    def add_node(self, key, player, untried, terminal=0, winner=0):
+        """Add a node for the position with hash key and return its id"""
+        node = len(self.visits)
+        self.index[key] = node
+        self.visits.append(0)
+        self.wins.append(0.0)
+        self.edges.append([])
+        self.edge_visits.append([])
+        self.child_count.append(0)
+        self.untried.append(untried)
+        self.player.append(player)
+        self.terminal.append(terminal)
+        self.winner.append(winner)
+        return node
+    
+    def select_edge(self, node):
+        """
+        Select the edge out of node with the highest UCB score
+        The value comes from the shared child node, the exploration term from the edge's own visits
+        """
+        visits = self.visits
+        wins = self.wins
+        log_visits = math.log(visits[node])
+        
+        best_edge = 0
+        best_score = -1.0
+        for edge, ((move, child), edge_visits) in enumerate(zip(self.edges[node], self.edge_visits[node])):
+            if edge_visits == 0:
+                return edge
+            score = wins[child] / visits[child] + C * math.sqrt(log_visits / edge_visits)
+            if score > best_score:
+                best_score = score
+                best_edge = edge
+        return best_edge
+    
+    def expand(self, node, board):
+        """
+        Add an edge for a random untried move of node
+        board must hold node's position; the edge's move is left played on it
+        Returns (edge, child, is_new); is_new is False when the move reached a known position
+        """
+        untried = self.untried[node]
+        for _ in range(random.randrange(untried.bit_count())):
+            untried &= untried - 1
+        bit = untried & -untried
+        self.untried[node] ^= bit
+        cell = bit.bit_length() - 1
         
-        # Update wins based on the result
-        if result == 2:  # AI wins
-            self.wins += 1
-        elif result is None:  # Draw
-            self.wins += 0.5
+        player = 3 - self.player[node]
+        row, col = divmod(cell, board.size)
+        board.make_move(row, col, player)
         
-        # Backpropagate to parent
-        if self.parent:
-            self.parent.backpropagate(result)
+        child = self.index.get(board.hash)
+        is_new = child is None
+        if not is_new:
+            self.expansions_saved += 1
+        # The game ends at the child if this move wins or fills the board
+        elif board.wins_through(row, col, player):
+            child = self.add_node(board.hash, player, 0, 1, player)
+        elif board.is_board_full():
+            child = self.add_node(board.hash, player, 0, 1)
+        else:
+            child = self.add_node(board.hash, player, board.full_mask & ~board.occupied)
+        
+        self.edges[node].append((cell, child))
+        self.edge_visits[node].append(0)
+        self.child_count[node] += 1
+        return self.child_count[node] - 1, child, is_new
+    
+    def backpropagate(self, path, leaf, result):
+        """
+        Add the result to every edge and node walked in the iteration
+        path: (node, edge) pairs from the root; leaf: the node reached at the end
+        """
+        visits = self.visits
+        wins = self.wins
+        player = self.player
+        for node, edge in path:
+            self.edge_visits[node][edge] += 1
+        for node in [node for node, _ in path] + [leaf]:
+            visits[node] += 1
+            # Update wins from the side of the player who moved into this node
+            if result == player[node]:
+                wins[node] += 1
+            elif result is None:  # Draw
+                wins[node] += 0.5
+    
+    def extract(self, node):
+        """
+        Copy the part of the graph reachable from node into a new graph with node
+        as the root (id 0); positions that can no longer come up are left behind
+        """
+        keys = {old: key for key, old in self.index.items()}
+        graph = MCTSGraph()
+        new_ids = {}
+        queue = [node]
+        seen = {node}
+        for old in queue:  # The queue grows while it is walked
+            new = graph.add_node(keys[old], self.player[old], self.untried[old], self.terminal[old], self.winner[old])
+            graph.visits[new] = self.visits[old]
+            graph.wins[new] = self.wins[old]
+            graph.child_count[new] = self.child_count[old]
+            graph.edge_visits[new] = list(self.edge_visits[old])
+            new_ids[old] = new
+            for _, child in self.edges[old]:
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
+        for old, new in new_ids.items():
+            graph.edges[new] = [(move, new_ids[child]) for move, child in self.edges[old]]
+        return graph
+    
+    def child_stats(self, node):
+        """
+        List of (move, visits, wins, proof) for the expanded moves of node
+        Visits are the edge's; wins are the child's win rate scaled to them.
+        The graph does not run the solver, so nothing is proven
+        """
+        stats = []
+        for (move, child), edge_visits in zip(self.edges[node], self.edge_visits[node]):
+            rate = self.wins[child] / self.visits[child] if self.visits[child] else 0.0
+            stats.append((move, edge_visits, rate * edge_visits, UNPROVEN))
+        return stats
+    
+    def best_move(self, node):
+        """Move of the most visited edge out of node, or -1 if it has none"""
+        if not self.edges[node]:
+            return -1
+        edge_visits = self.edge_visits[node]
+        return self.edges[node][edge_visits.index(max(edge_visits))][0]
 
 class MCTSAI:
     def __init__(self):
@@ -134,73 +600,402 @@ class MCTSAI:
         self.max_time = 0.8  # Reduced maximum thinking time to prevent freezing
         self.difficulty = "medium"  # Default difficulty
         self.timeout_occurred = False  # Flag to track timeout events
+        self.iterations = 0  # Iterations run by the last make_move
+        self.tree = None  # Search tree of the last make_move
+        # Playouts per expanded leaf; above 1 they run as one batch (vectorized when numpy is installed)
+        self.playouts_per_leaf = 1
+        # Processes for root-parallel search; 1 searches in this process
+        self.workers = 1
+        self.root_stats = {}  # Merged move -> (visits, wins, proof) of the last parallel search
+        # Keep the tree between moves and continue from the subtree of the position reached
+        self.tree_reuse = True
+        self.tree_position = None  # (board size, stone masks) at the root of self.tree
+        self.move_log = []  # Warm-start statistics for every move searched in this process
+        self.verbose = False  # Print the warm-start statistics after each move
+        # RAVE: blend all-moves-as-first statistics into selection (single playouts per leaf only)
+        self.use_rave = False
+        self.rave_equivalence = RAVE_EQUIVALENCE
+        # Share one node between transpositions (MCTSGraph); single playouts, no RAVE
+        self.use_transpositions = False
+        # MCTS-Solver: prove wins and losses in the tree and stop once the root is proven
+        self.use_solver = True
+        self.profile = False  # Time each phase of the search loop into phase_times
+        self.phase_times = {}  # Seconds spent in select / expand / simulate / backprop by the last search
     
-    def make_move(self, board, game_logic):
-        """Make a move using Monte Carlo Tree Search"""
-        # Adjust iterations based on difficulty
-        if self.difficulty == "easy":
-            self.max_iterations = 200
-            self.max_time = 0.5
-        elif self.difficulty == "medium":
-            self.max_iterations = 500
-            self.max_time = 1.0
-        else:  # hard
-            self.max_iterations = 1000
-            self.max_time = 2.0
+    def copy_board(self, board):
+        """
+        Working copy of the position for the search
+        Made once per make_move; the search plays and takes back moves on it
+        """
+        state = BitBoard()
+        state.size = board.size
+        state.reset()
+        # Board and BitBoard both keep the stone masks, hash and side to move
+        state.masks = board.masks[:]
+        state.occupied = board.masks[1] | board.masks[2]
+        state.hash = board.hash
+        state.side_to_move = board.side_to_move
+        return state
+    
+    def simulate(self, board, player):
+        """
+        Simulate a random game from the board's position with player to move
+        The board is not changed. Returns the winner, or None for a draw
+        """
+        return random_playout(board.rules, board.masks, board.occupied, player)
+    
+    def simulate_batch(self, board, player, count):
+        """
+        Simulate count random games from the board's position with player to move
+        Returns (wins, draws, losses) from the side of player
+        """
+        return batch_playout(board.rules, board.masks, board.occupied, player, count)
+    
+    def search(self, state, current_player, tree=None):
+        """
+        Run MCTS from the position on state with current_player to move
+        state is played on and taken back, and ends at the same position
+        tree: a tree already rooted (at id 0) at this position to keep searching
+        Returns (tree, root)
+        """
+        if self.use_transpositions:
+            return self.search_graph(state, current_player, tree)
         
-        try:
-            # Create the root node
-            root = Node(board, game_logic)
+        if tree is None:
+            # Create the root node; its "player" is the one who moved last
+            tree = MCTSTree()
+            root = tree.add_root(3 - current_player, state.full_mask & ~state.occupied)
+        else:
+            root = 0
+        self.tree = tree
+        
+        use_rave = self.use_rave and self.playouts_per_leaf == 1
+        use_solver = self.use_solver
+        root_masks = state.masks[:]
+        size = state.size
+        
+        # Per-phase timers, only read while profiling
+        profile = self.profile
+        phase_times = self.phase_times = {'select': 0.0, 'expand': 0.0, 'simulate': 0.0, 'backprop': 0.0}
+        
+        # Start the timer; the clock is read every DEADLINE_CHECK_INTERVAL iterations
+        deadline = time.perf_counter() + self.max_time * 0.9
+        iterations = 0
+        self.timeout_occurred = False
+        
+        # Run MCTS for a fixed number of iterations or until time limit
+        while iterations < self.max_iterations:
+            # Check if we're approaching the time limit
+            if iterations % DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                self.timeout_occurred = True
+                break
             
-            # Start the timer
-            start_time = time.time()
-            iterations = 0
-            self.timeout_occurred = False
+            # Nothing left to search once the root is proven
+            if use_solver and tree.proof[root] != UNPROVEN:
+                break
             
-            # Run MCTS for a fixed number of iterations or until time limit
-            while iterations < self.max_iterations and (time.time() - start_time) < self.max_time:
-                # Check if we're approaching the time limit
-                if (time.time() - start_time) > (self.max_time * 0.9):
-                    self.timeout_occurred = True
-                    break
-                    
+            node = root
+            path = [root]  # Nodes walked in this iteration; their moves are on the shared board
+            try:
+                if profile:
+                    phase_start = time.perf_counter()
+                
                 # Selection: Select a promising node
-                node = root
-                try:
-                    while node.untried_moves == [] and node.children != [] and not node.game_logic.is_game_over():
-                        node = node.select_child()
-                except Exception as selection_error:
-                    print(f"Selection error: {selection_error}")
-                    break
+                while not tree.untried[node] and tree.child_count[node] and not tree.terminal[node]:
+                    if use_rave:
+                        node = tree.select_child_rave(node, self.rave_equivalence)
+                    else:
+                        node = tree.select_child(node)
+                    cell = tree.move[node]
+                    state.make_move(cell // size, cell % size, tree.player[node])
+                    path.append(node)
+                    if tree.proof[node] == PROVEN_DRAW:
+                        # Its value is known: score it as a draw without searching below it
+                        break
+                
+                if profile:
+                    now = time.perf_counter()
+                    phase_times['select'] += now - phase_start
+                    phase_start = now
                 
                 # Expansion: Expand the selected node
-                if not node.game_logic.is_game_over() and node.untried_moves:
-                    try:
-                        node = node.expand()
-                        if node is None:  # No expansion possible
-                            continue
-                    except Exception as expansion_error:
-                        print(f"Expansion error: {expansion_error}")
-                        continue
+                if not tree.terminal[node] and tree.untried[node]:
+                    node = tree.expand(node, state)
+                    path.append(node)
                 
-                # Simulation: Simulate a random game from the expanded node
-                try:
-                    result = node.simulate()
-                    
-                    # Backpropagation: Update statistics up the tree
-                    node.backpropagate(result)
-                except Exception as simulation_error:
-                    print(f"Simulation error: {simulation_error}")
-                    continue
+                if profile:
+                    now = time.perf_counter()
+                    phase_times['expand'] += now - phase_start
+                    phase_start = now
+                
+                # Simulation: play out random games from the new node
+                if self.playouts_per_leaf > 1:
+                    count = self.playouts_per_leaf
+                    if tree.terminal[node]:
+                        # Only the player who moved into a node can have won there
+                        wins, draws, losses = (count, 0, 0) if tree.winner[node] else (0, count, 0)
+                    elif tree.proof[node] == PROVEN_DRAW:
+                        wins, draws, losses = 0, count, 0
+                    else:
+                        losses, draws, wins = self.simulate_batch(state, 3 - tree.player[node], count)
+                elif tree.terminal[node]:
+                    result = tree.winner[node] or None
+                elif tree.proof[node] == PROVEN_DRAW:
+                    result = None
+                elif use_rave:
+                    # Everything played below the root: the tree path, then the rollout
+                    played = [0, state.masks[1] & ~root_masks[1], state.masks[2] & ~root_masks[2]]
+                    result = random_playout(state.rules, state.masks, state.occupied,
+                                            3 - tree.player[node], played=played)
+                else:
+                    result = self.simulate(state, 3 - tree.player[node])
+                
+                if profile:
+                    now = time.perf_counter()
+                    phase_times['simulate'] += now - phase_start
+                    phase_start = now
                 
-                iterations += 1
+                # Backpropagation: Update statistics along the path
+                if self.playouts_per_leaf > 1:
+                    tree.backpropagate_batch(path, wins, draws, losses)
+                else:
+                    tree.backpropagate(path, result)
+                    if use_rave:
+                        if tree.terminal[node] or tree.proof[node] == PROVEN_DRAW:
+                            played = [0, state.masks[1] & ~root_masks[1], state.masks[2] & ~root_masks[2]]
+                        tree.update_amaf(path, result, played)
+                
+                # Solver: carry a proven result up the tree
+                if use_solver:
+                    tree.solve(node)
+                
+                if profile:
+                    phase_times['backprop'] += time.perf_counter() - phase_start
+            except Exception as search_error:
+                print(f"MCTS iteration error: {search_error}")
+                break
+            finally:
+                # Take the moves back so the board is at the root position again
+                for node in reversed(path[1:]):
+                    cell = tree.move[node]
+                    state.undo_move(cell // size, cell % size)
+            
+            iterations += 1
+        
+        self.iterations = iterations
+        return tree, root
+    
+    def promote_subtree(self, state, current_player):
+        """
+        Find the subtree of the last search that matches the position on state
+        Works when exactly two moves were played since that search: ours, then
+        the opponent's. The matching node is copied out as the root of a new
+        tree and the rest of the old tree is freed. Returns None if not found
+        """
+        tree = self.tree
+        if not isinstance(tree, MCTSTree) or self.tree_position is None:
+            return None
+        size, old_masks = self.tree_position
+        self.tree = None
+        self.tree_position = None
+        if size != state.size:
+            return None
+        
+        opponent = 3 - current_player
+        if old_masks[current_player] & ~state.masks[current_player] or old_masks[opponent] & ~state.masks[opponent]:
+            return None  # Stones were taken off: a new game
+        ours = state.masks[current_player] & ~old_masks[current_player]
+        theirs = state.masks[opponent] & ~old_masks[opponent]
+        if ours.bit_count() != 1 or theirs.bit_count() != 1:
+            return None
+        
+        node = 0
+        for cell in (ours.bit_length() - 1, theirs.bit_length() - 1):
+            node = tree.find_child(node, cell)
+            if node < 0:
+                return None
+        return tree.extract(node)
+    
+    def reuse_graph(self, state):
+        """
+        Return the graph of the last search if it holds the position on state,
+        cut down to the nodes reachable from that position, which becomes node 0
+        Positions are looked up by hash, so any moves may have been played since,
+        as long as they were added to the position searched last. A new game (an
+        empty board, or stones taken off) drops the graph
+        """
+        graph = self.tree
+        if not isinstance(graph, MCTSGraph) or self.tree_position is None:
+            return None
+        size, old_masks = self.tree_position
+        self.tree = None
+        self.tree_position = None
+        if size != state.size or not state.occupied:
+            return None
+        if old_masks[1] & ~state.masks[1] or old_masks[2] & ~state.masks[2]:
+            return None  # Stones were taken off: a new game
+        if state.hash not in graph.index:
+            return None
+        root = graph.index[state.hash]
+        return graph.extract(root) if root else graph
+    
+    def parallel_search(self, state, current_player):
+        """
+        Root-parallel search: every worker process searches the same position
+        with its own seed until one shared wall-clock stop time, so the move's
+        time budget is spent in every worker at once (max_iterations stays a
+        ceiling per worker); then the visits and wins of each root move are
+        summed. Returns the (row, col) picked by choose_move, or None
+        """
+        # Wall-clock time, since the workers' perf_counter clocks are not comparable;
+        # it is set before the pool is fetched, so a first start of the processes counts
+        stop_at = time.time() + self.max_time * 0.9
+        pool = get_worker_pool(self.workers)
+        jobs = [(state, current_player, self.max_iterations, stop_at, self.playouts_per_leaf,
+                 self.use_rave, self.rave_equivalence, self.use_transpositions, self.use_solver,
+                 random.getrandbits(32))
+                for _ in range(self.workers)]
+        
+        merged = {}
+        iterations = 0
+        for child_stats, worker_iterations in pool.map(_worker_search, jobs):
+            iterations += worker_iterations
+            for cell, visits, wins, proof in child_stats:
+                total_visits, total_wins, total_proof = merged.get(cell, (0, 0.0, UNPROVEN))
+                # A proof holds for the position, whichever worker found it
+                merged[cell] = (total_visits + visits, total_wins + wins, proof or total_proof)
+        
+        self.iterations = iterations
+        self.root_stats = merged
+        self.tree = None
+        self.tree_position = None
+        if not merged:
+            return None
+        best_cell = choose_move([(cell,) + stats for cell, stats in merged.items()])
+        return divmod(best_cell, state.size)
+    
+    def search_graph(self, state, current_player, graph=None):
+        """
+        Run MCTS on a transposition graph from the position on state
+        graph: a graph from an earlier move that holds this position, to keep searching
+        Returns (graph, root)
+        """
+        if graph is None or state.hash not in graph.index:
+            graph = MCTSGraph()
+            root = graph.add_node(state.hash, 3 - current_player, state.full_mask & ~state.occupied)
+        else:
+            root = graph.index[state.hash]
+        graph.expansions_saved = 0
+        self.tree = graph
+        self.phase_times = {}  # Phases are only timed on the tree
+        
+        # Start the timer; the clock is read every DEADLINE_CHECK_INTERVAL iterations
+        deadline = time.perf_counter() + self.max_time * 0.9
+        iterations = 0
+        self.timeout_occurred = False
+        
+        # Run MCTS for a fixed number of iterations or until time limit
+        while iterations < self.max_iterations:
+            # Check if we're approaching the time limit
+            if iterations % DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                self.timeout_occurred = True
+                break
+            
+            node = root
+            path = []  # (node, edge) pairs walked in this iteration
+            moves = []  # Moves played on the shared board in this iteration
+            try:
+                # Selection and expansion: keep going down through known positions
+                # until a new node is added or the game ends
+                while not graph.terminal[node]:
+                    if graph.untried[node]:
+                        edge, child, is_new = graph.expand(node, state)
+                    elif graph.child_count[node]:
+                        edge = graph.select_edge(node)
+                        child = graph.edges[node][edge][1]
+                        state.make_move(*divmod(graph.edges[node][edge][0], state.size), graph.player[child])
+                        is_new = False
+                    else:
+                        break
+                    moves.append(divmod(graph.edges[node][edge][0], state.size))
+                    path.append((node, edge))
+                    node = child
+                    if is_new:
+                        break
+                
+                # Simulation: Play out a random game from the new node
+                if graph.terminal[node]:
+                    result = graph.winner[node] or None
+                else:
+                    result = self.simulate(state, 3 - graph.player[node])
+                
+                # Backpropagation: Update statistics along the path
+                graph.backpropagate(path, node, result)
+            except Exception as search_error:
+                print(f"MCTS iteration error: {search_error}")
+                break
+            finally:
+                # Take the moves back so the board is at the root position again
+                for row, col in reversed(moves):
+                    state.undo_move(row, col)
+            
+            iterations += 1
+        
+        self.iterations = iterations
+        return graph, root
+    
+    def make_move(self, board, game_logic):
+        """Make a move using Monte Carlo Tree Search"""
+        # Adjust the budget based on difficulty
+        if self.difficulty is not None:
+            self.max_time, self.max_iterations = DIFFICULTY_BUDGETS.get(self.difficulty, DIFFICULTY_BUDGETS["hard"])
+        # difficulty None keeps max_iterations / max_time as set by the caller
+        
+        try:
+            # One copy of the position, shared by every iteration
+            state = self.copy_board(board)
+            
+            current_player = game_logic.get_current_player()
+            if self.workers > 1:
+                try:
+                    move = self.parallel_search(state, current_player)
+                    if move is not None:
+                        return move
+                except Exception as pool_error:
+                    print(f"MCTS worker pool error: {pool_error}")
+                    # Fall back to searching in this process
+            
+            # Start from the part of the last tree that matches this position
+            if self.use_transpositions:
+                tree = self.reuse_graph(state) if self.tree_reuse else None
+                warm_visits = tree.visits[tree.index[state.hash]] if tree is not None else 0
+            else:
+                tree = self.promote_subtree(state, current_player) if self.tree_reuse else None
+                warm_visits = tree.visits[0] if tree is not None else 0
+            reused_nodes = tree.node_count if tree is not None else 0
+            
+            tree, root = self.search(state, current_player, tree)
+            self.tree_position = (state.size, state.masks[:])
+            
+            self.move_log.append({
+                'reused': reused_nodes > 0,
+                'warm_visits': warm_visits,
+                'reused_nodes': reused_nodes,
+                'iterations': self.iterations,
+                'root_visits': tree.visits[root],
+                'tree_nodes': tree.node_count,
+                'expansions_saved': tree.expansions_saved if self.use_transpositions else 0,
+                'proven': not self.use_transpositions and tree.proof[root] != UNPROVEN,
+            })
+            if self.verbose:
+                print(f"MCTS: reused {reused_nodes} nodes with {warm_visits} visits, "
+                      f"ran {self.iterations} iterations, root has {tree.visits[root]} visits")
             
             # If we have children, choose the best move
-            if root.children:
+            if tree.child_count[root]:
                 try:
                     # Select the child with the most visits
-                    best_child = max(root.children, key=lambda child: child.visits)
-                    return best_child.move
+                    return divmod(tree.best_move(root), board.size)
                 except Exception as selection_error:
                     print(f"Best move selection error: {selection_error}")
                     # Fall through to fallback logic
@@ -220,7 +1015,7 @@ class MCTSAI:
             else:
                 # Board is full or in an invalid state
                 raise ValueError("No valid moves available")
-            
+        
         except Exception as e:
             print(f"Error in MCTS make_move: {e}")
             # Fallback: Find any valid move on the board
@@ -234,4 +1029,4 @@ class MCTSAI:
                 return random.choice(valid_moves)
             else:
                 # If no valid moves, return a default move that will be checked by the game logic
-                return (0, 0)
\ No newline at end of file
+                return (0, 0)
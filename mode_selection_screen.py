@@ -1,11 +1,12 @@
 import tkinter as tk
-import time
 from tkinter import font as tkfont
+from animation import Timeline, scaled
 
 class ModeSelectionScreen:
     def __init__(self, root, callback):
         self.root = root
         self.callback = callback  # Function to call with selected mode
+        self.selected = False  # Set by the first click on a choice
         
         # Modern color scheme (matching the existing screens)
         self.bg_color = '#0f0f1a'  # Deep blue-black
@@ -112,13 +113,13 @@ class ModeSelectionScreen:
         self.buttons_frame.pack_forget()
         
         # Fade in title
-        self.root.after(200, lambda: self.fade_in_widget(self.title_label, 0))
+        self.root.after(scaled(200), lambda: self.fade_in_widget(self.title_label, 0))
         
         # Fade in subtitle after title
-        self.root.after(800, lambda: self.fade_in_widget(self.subtitle_label, 0))
+        self.root.after(scaled(800), lambda: self.fade_in_widget(self.subtitle_label, 0))
         
         # Fade in buttons after subtitle
-        self.root.after(1400, lambda: self.fade_in_widget(self.buttons_frame, 0))
+        self.root.after(scaled(1400), lambda: self.fade_in_widget(self.buttons_frame, 0))
     
     def fade_in_widget(self, widget, alpha=0):
         """Fade in a widget gradually"""
@@ -147,24 +148,25 @@ class ModeSelectionScreen:
                 widget.configure(fg=new_color)
             
             # Schedule next fade step
-            self.root.after(30, lambda: self.fade_in_widget(widget, alpha))
+            self.root.after(scaled(30), lambda: self.fade_in_widget(widget, alpha))
     
     def select_mode(self, mode):
         """Handle mode selection with animation"""
+        # Only the first choice counts; the screen is on its way out
+        if self.selected:
+            return
+        self.selected = True
+        
         # Flash effect on selected button
         button = next(b for b, m in self.mode_buttons if m["name"] == mode["name"])
         
-        # Animate selection
+        # Animate selection, then fade out
+        timeline = Timeline(self.root)
         for _ in range(3):
-            button.config(bg=self.accent_color)
-            self.root.update()
-            time.sleep(0.05)
-            button.config(bg=mode["color"])
-            self.root.update()
-            time.sleep(0.05)
-        
-        # Fade out effect
-        self.fade_out(mode)
+            timeline.then(0, lambda: button.config(bg=self.accent_color))
+            timeline.then(50, lambda: button.config(bg=mode["color"]))
+            timeline.then(50)
+        timeline.start(lambda: self.fade_out(mode))
     
     def fade_out(self, selected_mode, alpha=1.0):
         """Create a fade out effect before transitioning"""
@@ -179,7 +181,7 @@ class ModeSelectionScreen:
                     new_color = f'#{int(r*alpha):02x}{int(g*alpha):02x}{int(b*alpha):02x}'
                     widget.configure(fg=new_color)
             
-            self.root.after(30, lambda: self.fade_out(selected_mode, alpha))
+            self.root.after(scaled(30), lambda: self.fade_out(selected_mode, alpha))
         else:
             # Destroy mode selection screen widgets and call the callback with selected mode
             for widget in self.main_frame.winfo_children():
@@ -0,0 +1,116 @@
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; batch_playout falls back to random_playout
+    np = None
+
+# Line cell index arrays for batch_playout, keyed by the Rules object
+_LINE_ARRAYS = {}
+
+# Generator used by batch_playout when the caller does not pass one
+_BATCH_RNG = np.random.default_rng() if np is not None else None
+
+
+def seed(value):
+    """
+    Seed the generators used by random_playout and batch_playout
+    Each search process calls this with its own value so their games differ
+    """
+    global _BATCH_RNG
+    random.seed(value)
+    if np is not None:
+        _BATCH_RNG = np.random.default_rng(value)
+
+
+def random_playout(rules, masks, occupied, player, rng=random, played=None):
+    """
+    Play random moves from a position to the end of the game
+    rules: Rules for the board; masks: stones bitmask per player (indexed by player);
+    occupied: bitmask of every stone; player: the player to move
+    played: optional [0, 0, 0]; the cells each player fills are ORed into played[player]
+    The empty cells are shuffled once and played in that order. After each stone
+    only the lines through its cell are checked, and the playout stops as soon as
+    no line can be completed by either side
+    Returns the winner, or None for a draw
+    """
+    stones = [0, masks[1], masks[2]]
+
+    # Lines that still hold stones of only one side (or none) can be won
+    live_lines = 0
+    for line in rules.line_masks:
+        if not (stones[1] & line and stones[2] & line):
+            live_lines += 1
+
+    winner = None
+    if live_lines:
+        cell_count = rules.size * rules.size
+        empty = [cell for cell in range(cell_count) if not occupied >> cell & 1]
+        rng.shuffle(empty)
+
+        cell_line_masks = rules.cell_line_masks
+        for cell in empty:
+            own = stones[player]
+            other = stones[3 - player]
+            placed = own | 1 << cell
+            stones[player] = placed
+            for line in cell_line_masks[cell]:
+                if placed & line == line:
+                    winner = player
+                    break
+                # The line dies when its first stone of this side joins the other side's
+                if other & line and not own & line:
+                    live_lines -= 1
+            if winner or not live_lines:
+                break
+            player = 3 - player
+
+    if played is not None:
+        played[1] |= stones[1] & ~masks[1]
+        played[2] |= stones[2] & ~masks[2]
+    return winner
+
+
+def batch_playout(rules, masks, occupied, player, count, rng=None):
+    """
+    Play count random games from one position at once
+    Arguments are the same as random_playout; rng is a numpy Generator
+    (or a random.Random when numpy is not installed)
+    Returns (wins, draws, losses) from the side of player
+    Without numpy this runs count scalar playouts
+    """
+    if np is None:
+        rng = rng or random
+        wins = losses = 0
+        for _ in range(count):
+            winner = random_playout(rules, masks, occupied, player, rng)
+            if winner == player:
+                wins += 1
+            elif winner is not None:
+                losses += 1
+        return wins, count - wins - losses, losses
+
+    rng = rng or _BATCH_RNG
+    cell_count = rules.size * rules.size
+    if rules not in _LINE_ARRAYS:
+        _LINE_ARRAYS[rules] = np.array(rules.lines, dtype=np.int16)
+    lines = _LINE_ARRAYS[rules]
+    never = cell_count + 1  # Later than any move
+
+    # step[g, j]: when game g plays the j-th empty cell, a random permutation per game
+    empty = np.array([cell for cell in range(cell_count) if not occupied >> cell & 1], dtype=np.int16)
+    step = rng.random((count, len(empty))).argsort(axis=1).argsort(axis=1)
+
+    earliest = []
+    for side, parity in ((player, 0), (3 - player, 1)):
+        # When each cell becomes this side's stone: -1 if it already is,
+        # never if it is (or will be) the other side's
+        side_time = np.full((count, cell_count), never, dtype=np.int16)
+        side_time[:, [cell for cell in range(cell_count) if masks[side] >> cell & 1]] = -1
+        side_time[:, empty] = np.where(step % 2 == parity, step, never)
+        # A line is complete once its last cell is filled; the side wins at its first complete line
+        earliest.append(side_time[:, lines].max(axis=2).min(axis=1))
+
+    wins = int(np.count_nonzero(earliest[0] < earliest[1]))
+    losses = int(np.count_nonzero(earliest[1] < earliest[0]))
+    return wins, count - wins - losses, losses
@@ -0,0 +1,91 @@
+# Rules are built once per (board size, win length) and shared by everyone
+_RULES = {}
+
+
+def get_win_length(board_size):
+    """
+    Number of marks in a row needed to win on a board size
+    - 3×3 board: 3 in a row
+    - 5×5 or larger: 5 in a row
+    """
+    if board_size == 3:
+        return 3
+    return 5
+
+
+def get_rules(board_size, win_length=None):
+    """
+    Return the cached Rules for a board size (and win length, default from get_win_length)
+    """
+    if win_length is None:
+        win_length = get_win_length(board_size)
+    key = (board_size, win_length)
+    if key not in _RULES:
+        _RULES[key] = Rules(board_size, win_length)
+    return _RULES[key]
+
+
+class Rules:
+    """
+    Every winning line for one board size and win length
+    Cells are flat indices row * size + col, the same layout as the board bitmasks
+    - lines[i]: tuple of the cell indices of line i
+    - line_masks[i]: bitmask of line i
+    - cell_lines[cell]: indices of the lines through that cell
+    - cell_line_masks[cell]: masks of the lines through that cell
+    - cells[cell]: (row, col) of that cell
+    """
+    def __init__(self, size, win_length):
+        self.size = size
+        self.win_length = win_length
+        self.cells = tuple((i, j) for i in range(size) for j in range(size))
+
+        lines = []
+        # Horizontal, vertical, diagonal, anti-diagonal
+        for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for row in range(size):
+                for col in range(size):
+                    end_row = row + d_row * (win_length - 1)
+                    end_col = col + d_col * (win_length - 1)
+                    if 0 <= end_row < size and 0 <= end_col < size:
+                        lines.append(tuple((row + d_row * i) * size + (col + d_col * i)
+                                           for i in range(win_length)))
+        self.lines = tuple(lines)
+
+        line_masks = []
+        for line in self.lines:
+            mask = 0
+            for cell in line:
+                mask |= 1 << cell
+            line_masks.append(mask)
+        self.line_masks = tuple(line_masks)
+
+        self.cell_lines = tuple(
+            tuple(index for index, line in enumerate(self.lines) if cell in line)
+            for cell in range(size * size)
+        )
+        self.cell_line_masks = tuple(
+            tuple(self.line_masks[index] for index in line_indices)
+            for line_indices in self.cell_lines
+        )
+
+    def has_won(self, stones):
+        """
+        Check if a player's stones bitmask covers any winning line
+        """
+        for mask in self.line_masks:
+            if stones & mask == mask:
+                return True
+        return False
+
+    def winning_line(self, stones, cell=None):
+        """
+        Find a winning line covered by the stones bitmask, only among the lines
+        through cell if given. Returns the line's (row, col) cells, or an empty list
+        """
+        line_indices = range(len(self.lines)) if cell is None else self.cell_lines[cell]
+        for index in line_indices:
+            mask = self.line_masks[index]
+            if stones & mask == mask:
+                return [self.cells[i] for i in self.lines[index]]
+        return []
@@ -0,0 +1,195 @@
+import random
+import unittest
+from unittest import mock
+
+from board import Board
+from bitboard import BitBoard
+from game_logic import GameLogic
+from ai import AI
+from transposition_table import TranspositionTable, EXACT, LOWER_BOUND
+
+
+def build_position(moves, size=3, board_class=Board):
+    """Play the moves through GameLogic, X first, and return (board, game_logic)"""
+    board = board_class()
+    board.size = size
+    board.reset()
+    game_logic = GameLogic(board)
+    for row, col in moves:
+        game_logic.make_move(row, col)
+    return board, game_logic
+
+
+def hard_ai():
+    ai = AI()
+    ai.difficulty = "hard"
+    return ai
+
+
+def random_position(rng, size):
+    """A random position reached through GameLogic that is not over yet"""
+    while True:
+        board, game_logic = build_position([], size)
+        for _ in range(rng.randrange(size * size - 1)):
+            game_logic.make_move(*rng.choice(board.get_empty_cells()))
+            if game_logic.is_game_over():
+                break
+        if not game_logic.is_game_over():
+            return board, game_logic
+
+
+def best_score(ai, board, game_logic, depth):
+    """Score of the best root move after iterative deepening to depth, as make_move searches it"""
+    ai.player = game_logic.get_current_player()
+    ai.transposition_table.clear()
+    ai.killer_moves = []
+    ai.history = {1: {}, 2: {}}
+    ai.evaluator = ai.create_evaluator(board, game_logic) if ai.use_incremental_evaluation else None
+    moves_with_scores = []
+    for search_depth in range(1, depth + 1):
+        ai.search_depth = search_depth
+        moves_with_scores = ai.search_root(board, game_logic, [move for move, _ in moves_with_scores])
+    return moves_with_scores[0][1]
+
+
+class SideToMoveTest(unittest.TestCase):
+    # X: (0, 0) (0, 1); O: (1, 0) (1, 1). Both threaten a row; X is to move
+    THREATS = [(0, 0), (1, 0), (0, 1), (1, 1)]
+
+    def test_x_takes_the_winning_move(self):
+        for board_class in (Board, BitBoard):
+            board, game_logic = build_position(self.THREATS, board_class=board_class)
+            self.assertEqual(game_logic.get_current_player(), 1)
+            self.assertEqual(hard_ai().make_move(board, game_logic), (0, 2))
+
+    def test_o_takes_the_winning_move(self):
+        # X wasted a move, so now O wins on the middle row
+        board, game_logic = build_position(self.THREATS + [(2, 2)])
+        self.assertEqual(game_logic.get_current_player(), 2)
+        self.assertEqual(hard_ai().make_move(board, game_logic), (1, 2))
+
+    def test_search_leaves_the_board_unchanged(self):
+        board, game_logic = build_position(self.THREATS, size=5)
+        before = [row[:] for row in board.board]
+        hash_before = board.hash
+        ai = hard_ai()
+        ai.make_move(board, game_logic)
+        self.assertEqual(board.board, before)
+        self.assertEqual(board.hash, hash_before)
+        self.assertEqual(ai.move_stack, [])
+
+
+    def test_search_for_o_opening_leaves_the_hash_unchanged(self):
+        # The GUI lets the AI open as O
+        for board_class in (Board, BitBoard):
+            board, game_logic = build_position([], board_class=board_class)
+            game_logic.set_current_player(2)
+            hash_before = board.hash
+            hard_ai().make_move(board, game_logic)
+            self.assertEqual(board.hash, hash_before)
+            self.assertEqual(board.side_to_move, 2)
+
+    def test_out_of_turn_make_undo_restores_the_hash(self):
+        for board_class in (Board, BitBoard):
+            board, _ = build_position([], board_class=board_class)
+            board.make_move(0, 0, 2)
+            board.undo_move(0, 0)
+            self.assertEqual((board.hash, board.side_to_move), (0, 1))
+
+
+class SearchEnhancementTest(unittest.TestCase):
+    def test_enhancements_keep_the_best_score(self):
+        rng = random.Random(2)
+        for size, depth, count in ((5, 3, 30), (5, 2, 20), (3, 9, 10)):
+            for _ in range(count):
+                board, game_logic = random_position(rng, size)
+                plain = AI()
+                plain.use_transposition_table = False
+                plain.use_move_ordering = False
+                plain.use_root_pvs = False
+                plain.use_incremental_evaluation = False
+                enhanced = AI()
+                hash_before = board.hash
+                self.assertEqual(best_score(enhanced, board, game_logic, depth),
+                                 best_score(plain, board, game_logic, depth))
+                self.assertEqual(board.hash, hash_before)
+
+
+class DifficultyTest(unittest.TestCase):
+    # X has four in a row with (0, 4) to win; O threatens (1, 4) as well
+    FOUR_IN_A_ROW = [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2), (1, 2), (0, 3), (1, 3)]
+
+    def test_easy_can_miss_the_win_under_a_time_limit(self):
+        board, game_logic = build_position(self.FOUR_IN_A_ROW, size=5)
+        ai = AI()
+        ai.difficulty = "easy"
+        ai.max_depth = None
+        ai.time_limit = 0.05
+        # Draw a suboptimal pick, and from it the last of the top moves
+        with mock.patch("ai.random.random", return_value=0.99), \
+             mock.patch("ai.random.choices", side_effect=lambda population, weights: [population[-1]]):
+            move = ai.make_move(board, game_logic)
+        self.assertLess(ai.completed_depth, len(board.get_empty_cells()))
+        self.assertNotEqual(move, (0, 4))
+        self.assertIn(move, board.get_empty_cells())
+
+    def test_hard_takes_the_win_under_a_time_limit(self):
+        board, game_logic = build_position(self.FOUR_IN_A_ROW, size=5)
+        ai = hard_ai()
+        ai.max_depth = None
+        ai.time_limit = 0.05
+        self.assertEqual(ai.make_move(board, game_logic), (0, 4))
+
+
+class TranspositionTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(max_memory_mb=0.01)
+        # Two keys that fall in the same bucket
+        self.key = 5
+        self.other = 5 + self.table.index_mask + 1
+
+    def test_probe_finds_a_stored_entry(self):
+        self.table.store(self.key, 3, 10, EXACT, (1, 1))
+        self.assertEqual(self.table.probe(self.key), (self.key, 3, 10, EXACT, (1, 1)))
+        self.assertIsNone(self.table.probe(self.other))
+        self.assertEqual(self.table.stats()['collisions'], 1)
+
+    def test_deeper_entry_keeps_the_depth_slot(self):
+        self.table.store(self.key, 5, 10, EXACT, (0, 0))
+        self.table.store(self.other, 2, 20, LOWER_BOUND, (1, 1))
+        self.assertEqual(self.table.depth_slots[self.key & self.table.index_mask][0], self.key)
+        # The shallower entry went to the always-replace slot; both can be found
+        self.assertEqual(self.table.probe(self.key)[1], 5)
+        self.assertEqual(self.table.probe(self.other)[1], 2)
+
+    def test_always_replace_slot_takes_the_latest_shallow_entry(self):
+        third = self.other + self.table.index_mask + 1
+        self.table.store(self.key, 5, 10, EXACT, (0, 0))
+        self.table.store(self.other, 2, 20, EXACT, (1, 1))
+        self.table.store(third, 1, 30, EXACT, (2, 2))
+        self.assertIsNone(self.table.probe(self.other))
+        self.assertEqual(self.table.probe(third)[2], 30)
+        self.assertEqual(self.table.probe(self.key)[2], 10)
+
+    def test_deeper_search_moves_the_old_entry_down(self):
+        self.table.store(self.key, 2, 10, EXACT, (0, 0))
+        self.table.store(self.other, 4, 20, EXACT, (1, 1))
+        index = self.key & self.table.index_mask
+        self.assertEqual(self.table.depth_slots[index][0], self.other)
+        self.assertEqual(self.table.recent_slots[index][0], self.key)
+
+    def test_same_position_is_replaced_in_place(self):
+        self.table.store(self.key, 5, 10, EXACT, (0, 0))
+        self.table.store(self.key, 1, 12, LOWER_BOUND, (0, 1))
+        self.assertEqual(self.table.probe(self.key), (self.key, 1, 12, LOWER_BOUND, (0, 1)))
+        self.assertIsNone(self.table.recent_slots[self.key & self.table.index_mask])
+
+    def test_clear_empties_the_table(self):
+        self.table.store(self.key, 5, 10, EXACT, (0, 0))
+        self.table.clear()
+        self.assertIsNone(self.table.probe(self.key))
+        self.assertEqual(self.table.stats()['stores'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
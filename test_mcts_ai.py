@@ -0,0 +1,113 @@
+import unittest
+
+from board import Board
+from game_logic import GameLogic
+from mcts_ai import MCTSAI, MCTSGraph, PROVEN_LOSS, PROVEN_DRAW
+import playout
+
+
+def new_game(size):
+    board = Board()
+    board.size = size
+    board.reset()
+    return board, GameLogic(board)
+
+
+def graph_ai(iterations):
+    mcts_ai = MCTSAI()
+    mcts_ai.difficulty = None
+    mcts_ai.max_iterations = iterations
+    mcts_ai.max_time = 60  # Iterations are the only limit
+    mcts_ai.use_transpositions = True
+    return mcts_ai
+
+
+def solver_ai():
+    mcts_ai = graph_ai(5000)
+    mcts_ai.use_transpositions = False
+    return mcts_ai
+
+
+class SolverTest(unittest.TestCase):
+    def setUp(self):
+        playout.seed(1234)
+
+    def test_proves_the_immediate_win(self):
+        # X: (0, 0) (0, 1); O: (1, 0) (1, 1). X to move wins at (0, 2)
+        board, game_logic = new_game(3)
+        for move in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            game_logic.make_move(*move)
+        mcts_ai = solver_ai()
+        self.assertEqual(mcts_ai.make_move(board, game_logic), (0, 2))
+        # Lost for O, who moved into the root, as soon as the winning move is expanded
+        self.assertEqual(mcts_ai.tree.proof[0], PROVEN_LOSS)
+        self.assertLess(mcts_ai.iterations, 20)
+
+    def test_proves_a_drawn_ending(self):
+        # X O X / X O O / O X _: the last move draws
+        board, game_logic = new_game(3)
+        for move in [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0)]:
+            game_logic.make_move(*move)
+        mcts_ai = solver_ai()
+        self.assertEqual(mcts_ai.make_move(board, game_logic), (2, 2))
+        self.assertEqual(mcts_ai.tree.proof[0], PROVEN_DRAW)
+        self.assertLess(mcts_ai.iterations, 5)
+
+
+class MoveLogTest(unittest.TestCase):
+    def setUp(self):
+        playout.seed(1234)
+
+    def test_counts_expanded_nodes(self):
+        board, game_logic = new_game(5)
+        mcts_ai = solver_ai()
+        mcts_ai.max_iterations = 300
+        game_logic.make_move(*mcts_ai.make_move(board, game_logic))
+        tree = mcts_ai.tree
+        expanded = 1 + sum(tree.child_count[:tree.reserved])
+        self.assertEqual(mcts_ai.move_log[-1]['tree_nodes'], expanded)
+        self.assertLess(expanded, tree.reserved)
+
+        # The next search starts from the subtree under the moves played since
+        game_logic.make_move(*next(cell for cell in board.get_empty_cells()))
+        mcts_ai.make_move(board, game_logic)
+        reused = mcts_ai.move_log[-1]['reused_nodes']
+        self.assertGreater(reused, 0)
+        self.assertLessEqual(reused, 300)
+
+
+class GraphReuseTest(unittest.TestCase):
+    def setUp(self):
+        playout.seed(1234)
+
+    def test_promoted_graph_drops_unreachable_nodes(self):
+        board, game_logic = new_game(5)
+        mcts_ai = graph_ai(2000)
+        game_logic.make_move(*mcts_ai.make_move(board, game_logic))
+        searched_nodes = mcts_ai.tree.node_count
+
+        # The opponent's reply; the next search keeps only what is reachable from here
+        game_logic.make_move(*next(cell for cell in board.get_empty_cells()))
+        state = mcts_ai.copy_board(board)
+        graph = mcts_ai.reuse_graph(state)
+
+        self.assertIsInstance(graph, MCTSGraph)
+        self.assertLess(graph.node_count, searched_nodes)
+        self.assertEqual(graph.index[state.hash], 0)
+        for edges in graph.edges:
+            for _, child in edges:
+                self.assertLess(child, graph.node_count)
+
+    def test_new_game_discards_graph(self):
+        mcts_ai = graph_ai(500)
+        board, game_logic = new_game(3)
+        while not game_logic.is_game_over():
+            game_logic.make_move(*mcts_ai.make_move(board, game_logic))
+
+        board, game_logic = new_game(3)
+        mcts_ai.make_move(board, game_logic)
+        self.assertEqual(mcts_ai.move_log[-1]['reused_nodes'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
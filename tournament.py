@@ -0,0 +1,286 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+
+from headless import BOARD_TYPES, create_engine, parse_engine, play_game
+
+# Virtual draws added between every pair of engines when fitting Elo, so an
+# engine that won (or lost) every game still gets a finite rating
+PRIOR_DRAWS = 1
+
+# Two-sided 95% normal quantile for the Elo confidence intervals
+CONFIDENCE_Z = 1.96
+
+ELO_PER_NATURAL_UNIT = 400 / math.log(10)
+
+
+def build_schedule(engines, games_per_pair, size, seed):
+    """
+    Round-robin list of games: every pair of engines plays games_per_pair games,
+    swapping colours every game. Game ids and seeds depend only on the
+    arguments, so a rerun with the same ones produces the same schedule
+    """
+    schedule = []
+    for first in range(len(engines)):
+        for second in range(first + 1, len(engines)):
+            for round_index in range(games_per_pair):
+                x, o = (first, second) if round_index % 2 == 0 else (second, first)
+                game_id = len(schedule)
+                schedule.append({
+                    'game': game_id, 'size': size, 'seed': seed + game_id,
+                    'engines': {'1': engines[x]['name'], '2': engines[o]['name']},
+                })
+    return schedule
+
+
+def game_key(record):
+    """What a stored result has to match to count for a scheduled game"""
+    return record['game'], record['size'], record['seed'], record['engines']['1'], record['engines']['2']
+
+
+def _play_scheduled_game(job):
+    """Pool worker: play one scheduled game and return its result record"""
+    game, engines_by_name, board_name = job
+    engines = {1: engines_by_name[game['engines']['1']], 2: engines_by_name[game['engines']['2']]}
+    outcome = play_game(engines, game['size'], game['seed'], BOARD_TYPES[board_name])
+    record = dict(game)
+    record['winner'] = outcome['winner']
+    record['moves'] = len(outcome['moves'])
+    record['move_times_ms'] = {str(player): [round(seconds * 1000, 3) for seconds in times]
+                               for player, times in outcome['move_times'].items()}
+    return record
+
+
+def load_results(path, schedule):
+    """
+    Read the results already written to path that belong to this schedule
+    Returns (results by game id, number of lines that did not match)
+    """
+    results = {}
+    ignored = 0
+    if not os.path.exists(path):
+        return results, ignored
+
+    expected = {game_key(game): game['game'] for game in schedule}
+    with open(path) as results_file:
+        for line in results_file:
+            try:
+                record = json.loads(line)
+                game_id = expected[game_key(record)]
+            except (ValueError, KeyError, TypeError):
+                # A line cut short by an interrupted run, or a result from another schedule
+                ignored += 1
+                continue
+            results[game_id] = record
+    return results, ignored
+
+
+def fit_elo(names, results):
+    """
+    Bradley-Terry maximum likelihood ratings from the game results, with draws as
+    half a win each and PRIOR_DRAWS virtual draws per pair
+    Returns {name: (elo, error)}: ratings average 0 and error is the half-width
+    of the 95% confidence interval, from the inverse Fisher information
+    """
+    count = len(names)
+    index = {name: i for i, name in enumerate(names)}
+    games = [[0.0] * count for _ in range(count)]
+    score = [[0.0] * count for _ in range(count)]
+    for i in range(count):
+        for j in range(count):
+            if i != j:
+                games[i][j] = PRIOR_DRAWS
+                score[i][j] = 0.5 * PRIOR_DRAWS
+    for record in results:
+        x, o = index[record['engines']['1']], index[record['engines']['2']]
+        games[x][o] += 1
+        games[o][x] += 1
+        if record['winner'] is None:
+            score[x][o] += 0.5
+            score[o][x] += 0.5
+        elif record['winner'] == 1:
+            score[x][o] += 1
+        else:
+            score[o][x] += 1
+
+    # Newton's method with the first engine held at 0; the rest are solved relative to it
+    ratings = [0.0] * count
+    covariance = [[0.0] * count for _ in range(count)]
+    for _ in range(100):
+        gradient = [0.0] * count
+        information = [[0.0] * count for _ in range(count)]
+        for i in range(count):
+            for j in range(count):
+                if i == j or not games[i][j]:
+                    continue
+                expected = 1 / (1 + math.exp(ratings[j] - ratings[i]))
+                gradient[i] += score[i][j] - games[i][j] * expected
+                weight = games[i][j] * expected * (1 - expected)
+                information[i][i] += weight
+                information[i][j] -= weight
+
+        reduced = invert([row[1:] for row in information[1:]])
+        step = [sum(reduced[i][j] * gradient[j + 1] for j in range(count - 1)) for i in range(count - 1)]
+        for i in range(count - 1):
+            ratings[i + 1] += step[i]
+        for i in range(count - 1):
+            for j in range(count - 1):
+                covariance[i + 1][j + 1] = reduced[i][j]
+        if max((abs(value) for value in step), default=0.0) < 1e-9:
+            break
+
+    # Shift to a zero average; the variance of r_i - mean(r) follows from the covariance
+    mean = sum(ratings) / count
+    row_means = [sum(row) / count for row in covariance]
+    total_mean = sum(row_means) / count
+    fitted = {}
+    for name, i in index.items():
+        variance = covariance[i][i] - 2 * row_means[i] + total_mean
+        error = CONFIDENCE_Z * math.sqrt(max(variance, 0.0))
+        fitted[name] = ((ratings[i] - mean) * ELO_PER_NATURAL_UNIT, error * ELO_PER_NATURAL_UNIT)
+    return fitted
+
+
+def invert(matrix):
+    """Inverse of a small square matrix by Gauss-Jordan elimination"""
+    size = len(matrix)
+    augmented = [list(row) + [1.0 if i == j else 0.0 for j in range(size)] for i, row in enumerate(matrix)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(augmented[row][column]))
+        augmented[column], augmented[pivot] = augmented[pivot], augmented[column]
+        pivot_value = augmented[column][column]
+        augmented[column] = [value / pivot_value for value in augmented[column]]
+        for row in range(size):
+            if row != column and augmented[row][column]:
+                factor = augmented[row][column]
+                augmented[row] = [value - factor * pivot_row_value
+                                  for value, pivot_row_value in zip(augmented[row], augmented[column])]
+    return [row[size:] for row in augmented]
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def print_report(names, results, output=sys.stdout):
+    """Print the win/draw/loss tables, Elo ratings and move latencies"""
+    totals = {name: {'win': 0, 'draw': 0, 'loss': 0, 'times': []} for name in names}
+    pairs = {}
+    for record in results:
+        for player in ('1', '2'):
+            name = record['engines'][player]
+            opponent = record['engines']['2' if player == '1' else '1']
+            if record['winner'] is None:
+                outcome = 'draw'
+            else:
+                outcome = 'win' if str(record['winner']) == player else 'loss'
+            totals[name][outcome] += 1
+            totals[name]['times'] += record['move_times_ms'][player]
+            pair = pairs.setdefault((name, opponent), {'win': 0, 'draw': 0, 'loss': 0})
+            pair[outcome] += 1
+
+    ratings = fit_elo(names, results)
+    width = max(len(name) for name in names) + 2
+    print(f"\n{len(results)} games", file=output)
+    print(f"{'engine':<{width}}{'games':>7}{'wins':>6}{'draws':>7}{'losses':>8}{'score':>8}"
+          f"{'Elo':>8}{'95% CI':>9}{'mean ms':>10}{'p95 ms':>9}", file=output)
+    for name in sorted(names, key=lambda name: -ratings[name][0]):
+        total = totals[name]
+        played = total['win'] + total['draw'] + total['loss']
+        score = (total['win'] + 0.5 * total['draw']) / played if played else 0.0
+        elo, error = ratings[name]
+        times = total['times']
+        mean_ms = sum(times) / len(times) if times else 0.0
+        p95_ms = percentile(times, 0.95) if times else 0.0
+        print(f"{name:<{width}}{played:>7}{total['win']:>6}{total['draw']:>7}{total['loss']:>8}{score:>8.1%}"
+              f"{elo:>8.0f}{f'±{error:.0f}':>9}{mean_ms:>10.1f}{p95_ms:>9.1f}", file=output)
+
+    # Head to head: wins-draws-losses of the row engine against the column engine
+    print("\nhead to head (row engine's wins-draws-losses)", file=output)
+    cell_width = 12
+    label_width = width + len(str(len(names))) + 2
+    print(f"{'':<{label_width}}" + "".join(f"{'#' + str(column + 1):>{cell_width}}" for column in range(len(names))),
+          file=output)
+    for row_index, name in enumerate(names):
+        cells = []
+        for opponent in names:
+            pair = pairs.get((name, opponent))
+            cells.append("-" if pair is None else f"{pair['win']}-{pair['draw']}-{pair['loss']}")
+        print(f"{f'#{row_index + 1} {name}':<{label_width}}" + "".join(f"{cell:>{cell_width}}" for cell in cells),
+              file=output)
+
+
+def run_tournament(engines, games_per_pair, size, seed, workers, output_path, board_name="board"):
+    """
+    Play every scheduled game that output_path does not already hold, across a
+    pool of worker processes, appending each result as a JSON line as soon as
+    it finishes. Returns the results of the whole schedule played so far
+    """
+    schedule = build_schedule(engines, games_per_pair, size, seed)
+    results, ignored = load_results(output_path, schedule)
+    if ignored:
+        print(f"Ignoring {ignored} lines of {output_path} that are not part of this schedule", file=sys.stderr)
+    pending = [game for game in schedule if game['game'] not in results]
+    print(f"{len(schedule)} games scheduled, {len(results)} already played, {len(pending)} to play "
+          f"on {workers} worker(s)", file=sys.stderr)
+
+    engines_by_name = {engine['name']: engine for engine in engines}
+    jobs = [(game, engines_by_name, board_name) for game in pending]
+    with open(output_path, "a+") as output, multiprocessing.Pool(workers) as pool:
+        # Start on a new line if a killed run left half a record at the end
+        if output.tell():
+            output.seek(output.tell() - 1)
+            if output.read(1) != "\n":
+                output.write("\n")
+        try:
+            for record in pool.imap_unordered(_play_scheduled_game, jobs):
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                results[record['game']] = record
+                print(f"\r{len(results)}/{len(schedule)} games", end="", file=sys.stderr)
+        except KeyboardInterrupt:
+            pool.terminate()
+            print(f"\nInterrupted; run the same command again to play the remaining "
+                  f"{len(schedule) - len(results)} games", file=sys.stderr)
+    print(file=sys.stderr)
+    return [results[game_id] for game_id in sorted(results)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Round-robin tournament between engine configurations, with Elo ratings",
+        epilog="Engine specs are the same as for headless.py, e.g. minimax:max_depth=2 mcts:max_iterations=500. "
+               "Results are appended to --output as each game ends; rerunning the same command "
+               "skips the games already there")
+    parser.add_argument("engines", nargs="+", help="engine specs, at least two")
+    parser.add_argument("--games", type=int, default=10, help="games per pair of engines (colours alternate)")
+    parser.add_argument("--size", type=int, default=3, help="board size")
+    parser.add_argument("--seed", type=int, default=1234, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="game processes")
+    parser.add_argument("--board", choices=sorted(BOARD_TYPES), default="board", help="board implementation")
+    parser.add_argument("--output", default="tournament.jsonl", help="JSON lines file of game results")
+    args = parser.parse_args()
+
+    try:
+        engines = [parse_engine(spec) for spec in args.engines]
+        for engine in engines:
+            create_engine(engine)  # Check the settings before any game starts
+    except ValueError as spec_error:
+        parser.error(str(spec_error))
+    names = [engine['name'] for engine in engines]
+    if len(set(names)) != len(names) or len(names) < 2:
+        parser.error("give at least two different engine specs")
+
+    results = run_tournament(engines, args.games, args.size, args.seed, max(1, args.workers),
+                             args.output, args.board)
+    if results:
+        print_report(names, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Bound types stored with each entry
+EXACT = 0        # Score is the exact minimax value
+LOWER_BOUND = 1  # Search failed high: true value >= score
+UPPER_BOUND = 2  # Search failed low: true value <= score
+
+# Rough memory used by one stored entry (the tuple, its ints and the slot pointer)
+ENTRY_SIZE_BYTES = 200
+
+
+class TranspositionTable:
+    """
+    Fixed-size cache of search results keyed by the board's Zobrist hash
+    Each bucket has two slots: a depth-preferred slot that keeps the deepest
+    search seen for that bucket, and an always-replace slot for everything else
+    Entries are tuples: (key, depth, score, flag, best_move)
+    """
+    def __init__(self, max_memory_mb=16):
+        self.max_memory_mb = max_memory_mb
+
+        # Round the bucket count down to a power of two so the index is a bit mask
+        max_entries = max(2, int(max_memory_mb * 1024 * 1024) // ENTRY_SIZE_BYTES)
+        buckets = 1
+        while buckets * 4 <= max_entries:
+            buckets *= 2
+        self.index_mask = buckets - 1
+
+        self.depth_slots = [None] * buckets
+        self.recent_slots = [None] * buckets
+        self.reset_stats()
+
+    def probe(self, key):
+        """
+        Look up a position
+        Returns the stored entry tuple, or None if the position is not in the table
+        """
+        index = key & self.index_mask
+        deep = self.depth_slots[index]
+        if deep is not None and deep[0] == key:
+            self.hits += 1
+            return deep
+        recent = self.recent_slots[index]
+        if recent is not None and recent[0] == key:
+            self.hits += 1
+            return recent
+
+        # Bucket holds other positions: the index collided
+        if deep is not None or recent is not None:
+            self.collisions += 1
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, flag, best_move):
+        """
+        Store a search result, replacing by depth in the first slot and always in the second
+        """
+        index = key & self.index_mask
+        entry = (key, depth, score, flag, best_move)
+        self.stores += 1
+
+        deep = self.depth_slots[index]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            # Keep the entry we push out of the deep slot in the always-replace slot
+            if deep is not None and deep[0] != key:
+                self.recent_slots[index] = deep
+                self.overwrites += 1
+            self.depth_slots[index] = entry
+        else:
+            if self.recent_slots[index] is not None:
+                self.overwrites += 1
+            self.recent_slots[index] = entry
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters
+        """
+        self.depth_slots = [None] * len(self.depth_slots)
+        self.recent_slots = [None] * len(self.recent_slots)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Reset the hit / miss / collision counters
+        """
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def stats(self):
+        """
+        Return the counters as a dict
+        """
+        probes = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'hit_rate': self.hits / probes if probes else 0.0,
+            'capacity': 2 * len(self.depth_slots),
+        }